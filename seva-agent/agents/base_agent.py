@@ -2,13 +2,50 @@
 Base Agent class for all AWS service agents
 """
 import boto3
+import re
+import threading
 from abc import ABC, abstractmethod
+from botocore.config import Config
 from typing import Dict, List, Any, Optional
 
+# Shared by every agent client: adaptive retries back off under throttling,
+# keepalive and a larger pool avoid reconnecting between chat turns
+CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=30
+)
+
+def compile_keywords(keywords) -> "re.Pattern":
+    """One case-insensitive alternation, so can_handle is a single scan of the command"""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
 class BaseAgent(ABC):
     def __init__(self, session: boto3.Session):
         self.session = session
         self.service_name = self.get_service_name()
+        self._clients = {}
+        # Commands may run on several worker threads, and boto3 sessions are not thread-safe
+        self._lock = threading.Lock()
+    
+    def _client(self, service: str, region_name: Optional[str] = None):
+        """Return a cached boto3 client, creating it on first use"""
+        key = (service, region_name)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.session.client(service, region_name=region_name, config=CLIENT_CONFIG)
+                    self._clients[key] = client
+        return client
+    
+    @staticmethod
+    def _name_from_tags(resource: Dict[str, Any], default: Optional[str] = "Unnamed") -> Optional[str]:
+        """Value of the resource's Name tag, or the default when it has none"""
+        return next((tag['Value'] for tag in resource.get('Tags', ()) if tag['Key'] == 'Name'), default)
         
     @abstractmethod
     def get_service_name(self) -> str:
@@ -1,10 +1,13 @@
 """
 CloudWatch Service Agent
 """
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, compile_keywords
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 
+CLOUDWATCH_KEYWORDS = ("cloudwatch", "alarm", "metric", "monitor", "log")
+CLOUDWATCH_KEYWORD_RE = compile_keywords(CLOUDWATCH_KEYWORDS)
+
 class CloudWatchAgent(BaseAgent):
     def get_service_name(self) -> str:
         return "cloudwatch"
@@ -18,8 +21,7 @@ class CloudWatchAgent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        cw_keywords = ["cloudwatch", "alarm", "metric", "monitor", "log"]
-        return any(keyword in command.lower() for keyword in cw_keywords)
+        return CLOUDWATCH_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
@@ -38,7 +40,7 @@ class CloudWatchAgent(BaseAgent):
             return {"error": str(e)}
     
     def _list_alarms(self) -> Dict[str, Any]:
-        cloudwatch = self.session.client('cloudwatch')
+        cloudwatch = self._client('cloudwatch')
         response = cloudwatch.describe_alarms()
         
         alarms = []
@@ -59,7 +61,7 @@ class CloudWatchAgent(BaseAgent):
         }
     
     def _get_metrics(self) -> Dict[str, Any]:
-        cloudwatch = self.session.client('cloudwatch')
+        cloudwatch = self._client('cloudwatch')
         
         # Get some common metrics
         end_time = datetime.utcnow()
@@ -98,7 +100,7 @@ class CloudWatchAgent(BaseAgent):
             }
     
     def _get_log_groups(self) -> Dict[str, Any]:
-        logs = self.session.client('logs')
+        logs = self._client('logs')
         response = logs.describe_log_groups(limit=10)
         
         log_groups = []
@@ -1,10 +1,54 @@
 """
 EC2 Service Agent
 """
-from .base_agent import BaseAgent
-from typing import Dict, List, Any
+from .base_agent import BaseAgent, compile_keywords
+from botocore.exceptions import ClientError
+from typing import Dict, List, Any, Optional, Tuple
+import re
+import time
+
+EC2_KEYWORDS = ("ec2", "instance", "server", "vm", "security group")
+EC2_KEYWORD_RE = compile_keywords(EC2_KEYWORDS)
+
+# Instance ids are "i-" plus 17 hex digits (8 on instances launched before 2016)
+INSTANCE_ID_RE = re.compile(r'\bi-(?:[0-9a-f]{17}|[0-9a-f]{8})\b')
+
+# One scan finds either an instance id or the word after "instance"
+INSTANCE_REF_RE = re.compile(
+    r'(?P<id>\bi-(?:[0-9a-f]{17}|[0-9a-f]{8})\b)|(?<!\S)(?i:instance)\s+(?P<name>\S+)'
+)
+
+# Ordered dispatch rules, first match wins:
+# (all of these words, handler, whether the handler takes an instance id)
+EC2_COMMAND_RULES = [
+    (("list", "instance"), "_list_instances", False),
+    (("start", "instance"), "_start_instance", True),
+    (("stop", "instance"), "_stop_instance", True),
+    (("security", "group"), "_list_security_groups", False),
+]
+
+# User-facing messages for start/stop failures, keyed by EC2 error code
+INSTANCE_ERROR_MESSAGES = {
+    'InvalidInstanceID.NotFound': "Instance {} not found",
+    'InvalidInstanceID.Malformed': "'{}' is not a valid instance ID",
+    'IncorrectInstanceState': "Instance {} is not in a state that allows this operation",
+    'UnauthorizedOperation': "Not authorized to change the state of instance {}",
+}
+
+# Seconds a describe_instances result is reused between commands
+DESCRIBE_CACHE_TTL = 15
+
+# States worth showing in a listing (everything but shutting-down/terminated)
+LISTED_INSTANCE_STATES = ['pending', 'running', 'stopping', 'stopped']
 
 class EC2Agent(BaseAgent):
+    def __init__(self, session):
+        super().__init__(session)
+        self._name_index = None
+        # Bumped on every start/stop so cached descriptions are never served stale
+        self._generation = 0
+        self._describe_cache = None
+    
     def get_service_name(self) -> str:
         return "ec2"
     
@@ -18,57 +62,121 @@ class EC2Agent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        ec2_keywords = ["ec2", "instance", "server", "vm", "security group"]
-        return any(keyword in command.lower() for keyword in ec2_keywords)
+        return EC2_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
         
         try:
-            if "list" in command_lower and "instance" in command_lower:
-                return self._list_instances()
-            elif "start" in command_lower and "instance" in command_lower:
-                instance_id = self._extract_instance_id(command)
-                return self._start_instance(instance_id)
-            elif "stop" in command_lower and "instance" in command_lower:
-                instance_id = self._extract_instance_id(command)
-                return self._stop_instance(instance_id)
-            elif "security" in command_lower and "group" in command_lower:
-                return self._list_security_groups()
-            else:
-                return {"error": f"EC2 command not recognized: {command}"}
+            for required, handler, needs_instance in EC2_COMMAND_RULES:
+                if not all(word in command_lower for word in required):
+                    continue
+                
+                method = getattr(self, handler)
+                if needs_instance:
+                    instance_id = self._resolve_instance_id(command)
+                    if not instance_id:
+                        return {"error": "Instance ID or name not found"}
+                    try:
+                        return method(instance_id)
+                    except ClientError as e:
+                        message = INSTANCE_ERROR_MESSAGES.get(e.response['Error']['Code'])
+                        if message is None:
+                            raise
+                        return {"error": message.format(instance_id)}
+                return method()
+            
+            return {"error": f"EC2 command not recognized: {command}"}
                 
         except Exception as e:
             return {"error": str(e)}
     
-    def _extract_instance_id(self, command: str) -> str:
-        words = command.split()
-        for word in words:
-            if word.startswith("i-"):
-                return word
-        return None
+    def _parse_instance_ref(self, command: str) -> Tuple[Optional[str], Optional[str]]:
+        """(instance id, instance name) from a single pass over the command; an id wins"""
+        name = None
+        for match in INSTANCE_REF_RE.finditer(command):
+            if match.group('id'):
+                return match.group('id'), name
+            if name is None:
+                name = match.group('name')
+                # "instance i-..." is consumed by the name branch
+                if INSTANCE_ID_RE.fullmatch(name):
+                    return name, None
+        return None, name
     
-    def _list_instances(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
-        response = ec2.describe_instances()
+    def _resolve_instance_id(self, command: str) -> Optional[str]:
+        """Instance id from the command, looking it up by Name tag if only a name was given"""
+        instance_id, name = self._parse_instance_ref(command)
+        if instance_id:
+            return instance_id
+        if not name:
+            return None
+        
+        # The index covers every listed state, so a miss is final: a warm cache costs no
+        # call, a cold one exactly one describe (which also serves the next listing)
+        return self._get_name_index().get(name.lower())
+    
+    def _get_name_index(self) -> Dict[str, str]:
+        """Map of lowercased Name tag to instance id, rebuilt only when the describe cache refreshes"""
+        instances = self._describe_instances()
+        if self._name_index is None or self._name_index[0] is not instances:
+            index = {}
+            for instance in instances:
+                name = self._name_from_tags(instance, None)
+                if name:
+                    index[name.lower()] = instance['InstanceId']
+            self._name_index = (instances, index)
+        return self._name_index[1]
+    
+    def _describe_instances(self) -> List[Dict[str, Any]]:
+        """Listable instances, reused for DESCRIBE_CACHE_TTL seconds or until a start/stop"""
+        if self._describe_cache_is_fresh():
+            return self._describe_cache[2]
+        
+        generation = self._generation
+        ec2 = self._client('ec2')
+        paginator = ec2.get_paginator('describe_instances')
         
+        # Terminated instances linger in the API for a while; leave them out server-side
+        pages = paginator.paginate(
+            Filters=[{'Name': 'instance-state-name', 'Values': LISTED_INSTANCE_STATES}],
+            PaginationConfig={'PageSize': 100}
+        )
+        instances = [
+            instance
+            for page in pages
+            for reservation in page['Reservations']
+            for instance in reservation['Instances']
+        ]
+        
+        # Tag the result with the generation it was read under, so a start/stop that lands
+        # while the describe is in flight leaves it stale instead of fresh
+        self._describe_cache = (generation, time.monotonic(), instances)
+        return instances
+    
+    def _describe_cache_is_fresh(self) -> bool:
+        cached = self._describe_cache
+        return (
+            cached is not None
+            and cached[0] == self._generation
+            and time.monotonic() - cached[1] < DESCRIBE_CACHE_TTL
+        )
+    
+    def _invalidate_describe_cache(self):
+        with self._lock:
+            self._generation += 1
+    
+    def _list_instances(self) -> Dict[str, Any]:
         instances = []
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                name = "Unnamed"
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                
-                instances.append({
-                    "id": instance['InstanceId'],
-                    "name": name,
-                    "type": instance['InstanceType'],
-                    "state": instance['State']['Name'],
-                    "public_ip": instance.get('PublicIpAddress'),
-                    "private_ip": instance.get('PrivateIpAddress')
-                })
+        for instance in self._describe_instances():
+            instances.append({
+                "id": instance['InstanceId'],
+                "name": self._name_from_tags(instance),
+                "type": instance['InstanceType'],
+                "state": instance['State']['Name'],
+                "public_ip": instance.get('PublicIpAddress'),
+                "private_ip": instance.get('PrivateIpAddress')
+            })
         
         return {
             "service": "ec2",
@@ -78,8 +186,9 @@ class EC2Agent(BaseAgent):
         }
     
     def _start_instance(self, instance_id: str) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.start_instances(InstanceIds=[instance_id])
+        self._invalidate_describe_cache()
         
         return {
             "service": "ec2",
@@ -89,8 +198,9 @@ class EC2Agent(BaseAgent):
         }
     
     def _stop_instance(self, instance_id: str) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.stop_instances(InstanceIds=[instance_id])
+        self._invalidate_describe_cache()
         
         return {
             "service": "ec2",
@@ -100,7 +210,7 @@ class EC2Agent(BaseAgent):
         }
     
     def _list_security_groups(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.describe_security_groups()
         
         groups = []
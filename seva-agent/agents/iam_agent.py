@@ -1,11 +1,18 @@
 """
 IAM Service Agent
 """
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, compile_keywords
 from typing import Dict, List, Any
 import json
 
+IAM_KEYWORDS = ("iam", "user", "role", "policy", "permission", "access", "grant", "attach", "create")
+IAM_KEYWORD_RE = compile_keywords(IAM_KEYWORDS)
+
 class IAMAgent(BaseAgent):
+    def __init__(self, session):
+        super().__init__(session)
+        self._identity = None
+    
     def get_service_name(self) -> str:
         return "iam"
     
@@ -22,8 +29,7 @@ class IAMAgent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        iam_keywords = ["iam", "user", "role", "policy", "permission", "access", "grant", "attach", "create"]
-        return any(keyword in command.lower() for keyword in iam_keywords)
+        return IAM_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
@@ -53,8 +59,14 @@ class IAMAgent(BaseAgent):
         except Exception as e:
             return {"error": str(e)}
     
+    def _get_caller_identity(self) -> Dict[str, Any]:
+        """Look up the caller identity once; it does not change for a session"""
+        if self._identity is None:
+            self._identity = self._client('sts').get_caller_identity()
+        return self._identity
+    
     def _list_users(self) -> Dict[str, Any]:
-        iam = self.session.client('iam')
+        iam = self._client('iam')
         response = iam.list_users()
         
         users = []
@@ -74,7 +86,7 @@ class IAMAgent(BaseAgent):
         }
     
     def _list_roles(self) -> Dict[str, Any]:
-        iam = self.session.client('iam')
+        iam = self._client('iam')
         response = iam.list_roles()
         
         roles = []
@@ -94,7 +106,7 @@ class IAMAgent(BaseAgent):
         }
     
     def _list_policies(self) -> Dict[str, Any]:
-        iam = self.session.client('iam')
+        iam = self._client('iam')
         response = iam.list_policies(Scope='Local')  # Only customer managed policies
         
         policies = []
@@ -116,12 +128,13 @@ class IAMAgent(BaseAgent):
     def _grant_s3_permissions(self) -> Dict[str, Any]:
         try:
             # Get current user
-            sts = self.session.client('sts')
-            identity = sts.get_caller_identity()
+            identity = self._get_caller_identity()
             user_arn = identity['Arn']
             
-            if ':user/' in user_arn:
-                username = user_arn.split(':user/')[1]
+            _, is_user, user_path = user_arn.partition(':user/')
+            if is_user:
+                # Users created with a path have ARNs like ...:user/team/name
+                username = user_path.rpartition('/')[2]
             elif ':root' in user_arn:
                 # Root user - already has full permissions
                 return {
@@ -146,7 +159,7 @@ class IAMAgent(BaseAgent):
                 ]
             }
             
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             
             # Create policy
             policy_name = f"S3FullAccess-{username}"
@@ -204,7 +217,7 @@ class IAMAgent(BaseAgent):
                 ]
             }
             
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             policy_name = "S3AnalyticsPolicy"
             
             response = iam.create_policy(
@@ -226,12 +239,13 @@ class IAMAgent(BaseAgent):
     def _attach_policy_to_user(self) -> Dict[str, Any]:
         try:
             # Get current user
-            sts = self.session.client('sts')
-            identity = sts.get_caller_identity()
+            identity = self._get_caller_identity()
             user_arn = identity['Arn']
             
-            if ':user/' in user_arn:
-                username = user_arn.split(':user/')[1]
+            _, is_user, user_path = user_arn.partition(':user/')
+            if is_user:
+                # Users created with a path have ARNs like ...:user/team/name
+                username = user_path.rpartition('/')[2]
             elif ':root' in user_arn:
                 return {
                     "service": "iam",
@@ -242,7 +256,7 @@ class IAMAgent(BaseAgent):
                 return {"error": "Cannot determine username"}
             
             # Attach S3 full access policy
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             policy_arn = "arn:aws:iam::aws:policy/AmazonS3FullAccess"
             
             iam.attach_user_policy(
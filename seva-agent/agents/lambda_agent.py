@@ -1,8 +1,15 @@
 """
 Lambda Service Agent
 """
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, compile_keywords
 from typing import Dict, List, Any
+import re
+
+LAMBDA_KEYWORDS = ("lambda", "function", "serverless")
+LAMBDA_KEYWORD_RE = compile_keywords(LAMBDA_KEYWORDS)
+
+# The word after the first token containing "function"
+FUNCTION_NAME_RE = re.compile(r'\S*function\S*\s+(\S+)', re.IGNORECASE)
 
 class LambdaAgent(BaseAgent):
     def get_service_name(self) -> str:
@@ -18,8 +25,7 @@ class LambdaAgent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        lambda_keywords = ["lambda", "function", "serverless"]
-        return any(keyword in command.lower() for keyword in lambda_keywords)
+        return LAMBDA_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
@@ -40,14 +46,11 @@ class LambdaAgent(BaseAgent):
             return {"error": str(e)}
     
     def _extract_function_name(self, command: str) -> str:
-        words = command.split()
-        for i, word in enumerate(words):
-            if "function" in word.lower() and i + 1 < len(words):
-                return words[i + 1]
-        return None
+        match = FUNCTION_NAME_RE.search(command)
+        return match.group(1) if match else None
     
     def _list_functions(self) -> Dict[str, Any]:
-        lambda_client = self.session.client('lambda')
+        lambda_client = self._client('lambda')
         response = lambda_client.list_functions()
         
         functions = []
@@ -71,7 +74,7 @@ class LambdaAgent(BaseAgent):
         if not function_name:
             return {"error": "Function name required"}
             
-        lambda_client = self.session.client('lambda')
+        lambda_client = self._client('lambda')
         response = lambda_client.invoke(FunctionName=function_name)
         
         return {
@@ -85,7 +88,7 @@ class LambdaAgent(BaseAgent):
         if not function_name:
             return {"error": "Function name required"}
             
-        logs_client = self.session.client('logs')
+        logs_client = self._client('logs')
         log_group = f"/aws/lambda/{function_name}"
         
         try:
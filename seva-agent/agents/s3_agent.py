@@ -1,12 +1,78 @@
 """
 S3 Service Agent
 """
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, compile_keywords
 from typing import Dict, List, Any
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+import time
+from botocore.exceptions import ClientError
 import re
 import json
 
+# Cap on keys returned by a single listing; nobody reads more than this in chat
+MAX_LISTED_OBJECTS = 500
+
+# Seconds a bucket listing is reused for repeated "list objects" commands
+LISTING_CACHE_TTL = 30
+
+# Seconds the bucket names from the last list_buckets stand in for head_bucket probes
+BUCKET_SET_TTL = 60
+
+# Ordered dispatch rules, first match wins:
+# (all of these words, at least one of these words, handler, argument, error if bucket missing)
+S3_COMMAND_RULES = [
+    (("list", "bucket"), ("objects", "contents"), "_list_objects", "bucket", "Bucket name not found"),
+    (("list", "bucket"), (), "_list_buckets", None, None),
+    (("show", "objects", "bucket"), (), "_list_objects", "bucket", "Bucket name not found"),
+    (("create", "bucket"), (), "_create_bucket", "bucket", "Please specify bucket name"),
+    (("size", "bucket"), (), "_get_bucket_size", "bucket", "Please specify bucket name"),
+    (("policy", "bucket"), (), "_get_bucket_policy", "bucket", "Please specify bucket name"),
+    (("delete", "object"), (), "_delete_object", "command", None),
+    (("download",), ("file", "object"), "_download_object", "command", None),
+    (("copy",), ("file", "object"), "_copy_object", "command", None),
+]
+
+# Lifetime of generated download links, in seconds
+PRESIGNED_URL_EXPIRY = 3600
+
+# DeleteObjects accepts at most this many keys per request
+MAX_DELETE_BATCH = 1000
+
+# Key (or comma-separated keys) following the word "object"/"objects" or "file"
+DELETE_KEYS_RE = re.compile(r'(?<!\S)objects?\s+([^\s,]+(?:\s*,\s*[^\s,]+)*)', re.IGNORECASE)
+KEY_SEPARATOR_RE = re.compile(r'\s*,\s*')
+DOWNLOAD_KEY_RE = re.compile(r'(?<!\S)(?:file|object)\s+(\S+)', re.IGNORECASE)
+
+# S3 has no batch copy, so multi-key copies fan out over this many threads
+MAX_COPY_WORKERS = 16
+
+# "copy file <key>[, <key>...] from [bucket] <source> to [bucket] <dest>"
+COPY_OBJECT_RE = re.compile(
+    r'(?<!\S)(?:files?|objects?)\s+([^\s,]+(?:\s*,\s*[^\s,]+)*)\s+from\s+(?:bucket\s+)?(\S+)\s+to\s+(?:bucket\s+)?(\S+)',
+    re.IGNORECASE
+)
+
+# Words around a bucket name that are never the name itself
+NOT_AFTER_BUCKET = frozenset({'in', 'from', 'to', 'with', 'for', 'policy', 'size', 'info'})
+FILLER_AFTER_IN = frozenset({'my', 'bucket', 'the', 'a', 'an', 'objects'})
+KNOWN_BUCKET_MARKERS = ("tarbucket", "aws-agent", "tar-")
+NOT_A_BUCKET_NAME = frozenset({'show', 'list', 'get', 'bucket', 'buckets', 'objects', 'policy', 'size', 'info', 'in', 'from', 'to', 'my', 'the'})
+
+# Any of these substrings routes a command to the S3 agent
+S3_KEYWORDS = ("s3", "bucket", "object", "upload", "download", "move", "copy", "size", "storage", "info", "test", "access", "policy", "delete", "set", "make", "public", "private", "remove", "block")
+S3_KEYWORD_RE = compile_keywords(S3_KEYWORDS)
+
 class S3Agent(BaseAgent):
+    def __init__(self, session):
+        super().__init__(session)
+        self._listing_cache = {}
+        # Bumped by every write, so a listing fetched across a write is not cached
+        self._write_count = 0
+        self._bucket_names = (frozenset(), 0.0)
+        # A bucket's region never changes, so one get_bucket_location per bucket is enough
+        self._bucket_regions = {}
+    
     def get_service_name(self) -> str:
         return "s3"
     
@@ -31,95 +97,67 @@ class S3Agent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        s3_keywords = ["s3", "bucket", "object", "upload", "download", "move", "copy", "size", "storage", "info", "test", "access", "policy", "delete", "set", "make", "public", "private", "remove", "block"]
-        return any(keyword in command.lower() for keyword in s3_keywords)
+        return S3_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
         
         try:
-            if "list" in command_lower and "bucket" in command_lower:
-                if "objects" in command_lower or "contents" in command_lower:
+            for required, any_of, handler, argument, missing in S3_COMMAND_RULES:
+                if not all(word in command_lower for word in required):
+                    continue
+                if any_of and not any(word in command_lower for word in any_of):
+                    continue
+                
+                method = getattr(self, handler)
+                if argument == "bucket":
                     bucket_name = self._extract_bucket_name(command)
-                    if bucket_name:
-                        return self._list_objects(bucket_name)
-                    else:
-                        return {"error": "Bucket name not found"}
-                else:
-                    return self._list_buckets()
-            
-            elif "show" in command_lower and "objects" in command_lower and "bucket" in command_lower:
-                bucket_name = self._extract_bucket_name(command)
-                if bucket_name:
-                    return self._list_objects(bucket_name)
-                else:
-                    return {"error": "Bucket name not found"}
-            
-            elif "create" in command_lower and "bucket" in command_lower:
-                bucket_name = self._extract_bucket_name(command)
-                if bucket_name:
-                    return self._create_bucket(bucket_name)
-                else:
-                    return {"error": "Please specify bucket name"}
+                    if not bucket_name:
+                        return {"error": missing}
+                    return method(bucket_name)
+                if argument == "command":
+                    return method(command)
+                return method()
             
-            elif "size" in command_lower and "bucket" in command_lower:
-                bucket_name = self._extract_bucket_name(command)
-                if bucket_name:
-                    return self._get_bucket_size(bucket_name)
-                else:
-                    return {"error": "Please specify bucket name"}
-            
-            elif "policy" in command_lower and "bucket" in command_lower:
-                bucket_name = self._extract_bucket_name(command)
-                if bucket_name:
-                    return self._get_bucket_policy(bucket_name)
-                else:
-                    return {"error": "Please specify bucket name"}
-            
-            elif "delete" in command_lower and "object" in command_lower:
-                return self._delete_object(command)
-            
-            else:
-                return {"error": f"S3 command not recognized: {command}"}
+            return {"error": f"S3 command not recognized: {command}"}
                 
         except Exception as e:
             return {"error": str(e)}
     
     def _extract_bucket_name(self, command: str) -> str:
         words = command.split()
+        lowered = [word.lower() for word in words]
         
         # Handle "objects in my bucket bucketname" pattern
-        for i, word in enumerate(words):
-            if word.lower() == "bucket" and i + 1 < len(words):
-                next_word = words[i + 1]
-                if next_word.lower() not in ['in', 'from', 'to', 'with', 'for', 'policy', 'size', 'info']:
-                    return next_word
+        for i, word in enumerate(lowered):
+            if word == "bucket" and i + 1 < len(words):
+                if lowered[i + 1] not in NOT_AFTER_BUCKET:
+                    return words[i + 1]
         
         # Handle "in bucketname" or "in my bucket bucketname"
-        for i, word in enumerate(words):
-            if word.lower() == "in":
+        for i, word in enumerate(lowered):
+            if word == "in":
                 # Look for bucket name after "in"
                 for j in range(i + 1, len(words)):
-                    candidate = words[j]
-                    if candidate.lower() not in ['my', 'bucket', 'the', 'a', 'an', 'objects']:
-                        return candidate
+                    if lowered[j] not in FILLER_AFTER_IN:
+                        return words[j]
         
         # Look for known bucket patterns
         for word in words:
-            if any(pattern in word for pattern in ["tarbucket", "aws-agent", "tar-"]):
+            if any(pattern in word for pattern in KNOWN_BUCKET_MARKERS):
                 return word
         
-        # Last resort: find any word that looks like a bucket name
-        for word in reversed(words):
-            if (len(word) > 3 and 
+        # Last resort: find any word that looks like a bucket name (S3 names are at most 63 chars)
+        for word, lower in zip(reversed(words), reversed(lowered)):
+            if (3 < len(word) <= 63 and 
                 not word.startswith('-') and 
-                word.lower() not in ['show', 'list', 'get', 'bucket', 'buckets', 'objects', 'policy', 'size', 'info', 'in', 'from', 'to', 'my', 'the']):
+                lower not in NOT_A_BUCKET_NAME):
                 return word
         
         return None
     
     def _list_buckets(self) -> Dict[str, Any]:
-        s3 = self.session.client('s3')
+        s3 = self._client('s3')
         response = s3.list_buckets()
         
         buckets = []
@@ -128,6 +166,9 @@ class S3Agent(BaseAgent):
                 "name": bucket['Name'],
                 "created": bucket['CreationDate'].isoformat()
             })
+        names = frozenset(bucket['name'] for bucket in buckets)
+        with self._lock:
+            self._bucket_names = (names, time.monotonic())
         
         return {
             "service": "s3",
@@ -137,29 +178,54 @@ class S3Agent(BaseAgent):
         }
     
     def _list_objects(self, bucket_name: str) -> Dict[str, Any]:
-        s3 = self.session.client('s3')
-        response = s3.list_objects_v2(Bucket=bucket_name)
+        cached = self._listing_cache.get(bucket_name)
+        if cached and time.monotonic() - cached[1] < LISTING_CACHE_TTL:
+            return cached[0]
         
-        objects = []
-        if 'Contents' in response:
-            for obj in response['Contents']:
-                objects.append({
-                    "key": obj['Key'],
-                    "size": obj['Size'],
-                    "modified": obj['LastModified'].isoformat()
-                })
+        writes_seen = self._write_count
+        s3 = self._client('s3')
+        paginator = s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket_name)
         
-        return {
+        # Stop paging as soon as the cap is hit instead of listing the whole bucket
+        contents = (obj for page in pages for obj in page.get('Contents', ()))
+        objects = [
+            {
+                "key": obj['Key'],
+                "size": obj['Size'],
+                "modified": obj['LastModified'].isoformat()
+            }
+            for obj in islice(contents, MAX_LISTED_OBJECTS + 1)
+        ]
+        
+        truncated = len(objects) > MAX_LISTED_OBJECTS
+        if truncated:
+            objects.pop()
+        
+        result = {
             "service": "s3",
             "operation": "list_objects",
             "bucket": bucket_name,
             "result": objects,
-            "count": len(objects)
+            "count": len(objects),
+            "truncated": truncated
         }
+        with self._lock:
+            if self._write_count == writes_seen:
+                self._listing_cache[bucket_name] = (result, time.monotonic())
+        return result
+    
+    def _invalidate_listing(self, bucket_name: str):
+        with self._lock:
+            self._write_count += 1
+            self._listing_cache.pop(bucket_name, None)
     
     def _create_bucket(self, bucket_name: str) -> Dict[str, Any]:
-        s3 = self.session.client('s3')
+        s3 = self._client('s3')
         s3.create_bucket(Bucket=bucket_name)
+        with self._lock:
+            names, listed_at = self._bucket_names
+            self._bucket_names = (names | {bucket_name}, listed_at)
         
         return {
             "service": "s3",
@@ -168,23 +234,34 @@ class S3Agent(BaseAgent):
             "result": "success"
         }
     
+    def _bucket_region(self, bucket_name: str) -> str:
+        """Region the bucket lives in, looked up once and then cached"""
+        region = self._bucket_regions.get(bucket_name)
+        if region is None:
+            constraint = self._client('s3').get_bucket_location(Bucket=bucket_name)['LocationConstraint']
+            # us-east-1 reports no constraint, and old eu-west-1 buckets report 'EU'
+            region = {None: 'us-east-1', 'EU': 'eu-west-1'}.get(constraint, constraint)
+            with self._lock:
+                self._bucket_regions[bucket_name] = region
+        return region
+    
+    def _is_known_bucket(self, bucket_name: str) -> bool:
+        """True if a recent list_buckets already showed this bucket exists"""
+        names, listed_at = self._bucket_names
+        return bucket_name in names and time.monotonic() - listed_at < BUCKET_SET_TTL
+    
     def _get_bucket_size(self, bucket_name: str) -> Dict[str, Any]:
         try:
-            s3 = self.session.client('s3')
-            try:
-                location = s3.get_bucket_location(Bucket=bucket_name)
-                bucket_region = location['LocationConstraint'] or 'us-east-1'
-                s3 = self.session.client('s3', region_name=bucket_region)
-            except:
-                pass
+            s3 = self._client('s3')
             
-            response = s3.list_objects_v2(Bucket=bucket_name)
+            paginator = s3.get_paginator('list_objects_v2')
             
             total_size = 0
             object_count = 0
             
-            if 'Contents' in response:
-                for obj in response['Contents']:
+            # Walk every page; a single call stops at 1000 keys and undercounts
+            for page in paginator.paginate(Bucket=bucket_name, PaginationConfig={'PageSize': 1000}):
+                for obj in page.get('Contents', ()):
                     total_size += obj['Size']
                     object_count += 1
             
@@ -204,13 +281,7 @@ class S3Agent(BaseAgent):
     
     def _get_bucket_policy(self, bucket_name: str) -> Dict[str, Any]:
         try:
-            s3 = self.session.client('s3')
-            try:
-                location = s3.get_bucket_location(Bucket=bucket_name)
-                bucket_region = location['LocationConstraint'] or 'us-east-1'
-                s3 = self.session.client('s3', region_name=bucket_region)
-            except:
-                pass
+            s3 = self._client('s3')
             
             try:
                 response = s3.get_bucket_policy(Bucket=bucket_name)
@@ -225,8 +296,8 @@ class S3Agent(BaseAgent):
                         "policy": policy
                     }
                 }
-            except Exception as e:
-                if 'NoSuchBucketPolicy' in str(e):
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'NoSuchBucketPolicy':
                     return {
                         "service": "s3",
                         "operation": "get_bucket_policy",
@@ -244,38 +315,153 @@ class S3Agent(BaseAgent):
     
     def _delete_object(self, command: str) -> Dict[str, Any]:
         try:
-            words = command.split()
+            match = DELETE_KEYS_RE.search(command)
             
-            object_name = None
-            for i, word in enumerate(words):
-                if word.lower() == "object" and i + 1 < len(words):
-                    object_name = words[i + 1]
-                    break
-            
-            if not object_name:
+            # "delete objects a.txt, b.txt ..." removes several keys at once
+            keys = KEY_SEPARATOR_RE.split(match.group(1)) if match else []
+            if not keys:
                 return {"error": "Object name not found"}
             
             bucket_name = self._extract_bucket_name(command)
             if not bucket_name:
                 return {"error": "Bucket name not found"}
             
-            s3 = self.session.client('s3')
-            try:
-                location = s3.get_bucket_location(Bucket=bucket_name)
-                bucket_region = location['LocationConstraint'] or 'us-east-1'
-                s3 = self.session.client('s3', region_name=bucket_region)
-            except:
-                pass
+            s3 = self._client('s3')
             
-            s3.delete_object(Bucket=bucket_name, Key=object_name)
+            try:
+                if len(keys) == 1:
+                    s3.delete_object(Bucket=bucket_name, Key=keys[0])
+                else:
+                    # One DeleteObjects request per batch instead of a round-trip per key
+                    failed = []
+                    for start in range(0, len(keys), MAX_DELETE_BATCH):
+                        batch = keys[start:start + MAX_DELETE_BATCH]
+                        response = s3.delete_objects(
+                            Bucket=bucket_name,
+                            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                        )
+                        failed.extend(err['Key'] for err in response.get('Errors', ()))
+                    if failed:
+                        return {"error": f"Failed to delete: {', '.join(failed)}"}
+            except ClientError as e:
+                if e.response['Error']['Code'] in ('NoSuchBucket', '404'):
+                    return {"error": f"Bucket '{bucket_name}' not found"}
+                raise
+            finally:
+                # Even a partial failure may have removed keys
+                self._invalidate_listing(bucket_name)
             
             return {
                 "service": "s3",
                 "operation": "delete_object",
                 "bucket": bucket_name,
+                "key": ", ".join(keys),
+                "result": "Object deleted successfully" if len(keys) == 1 else f"{len(keys)} objects deleted successfully"
+            }
+            
+        except Exception as e:
+            return {"error": f"Failed to delete object: {str(e)}"}
+    
+    def _download_object(self, command: str) -> Dict[str, Any]:
+        try:
+            match = DOWNLOAD_KEY_RE.search(command)
+            if not match:
+                return {"error": "Object name not found"}
+            object_name = match.group(1)
+            
+            bucket_name = self._extract_bucket_name(command)
+            if not bucket_name:
+                return {"error": "Bucket name not found"}
+            
+            # The SigV4 signature is bound to a region, and a presigned URL is never sent through
+            # botocore's region redirector, so it must be signed with the bucket's own region
+            try:
+                s3 = self._client('s3', region_name=self._bucket_region(bucket_name))
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'NoSuchBucket':
+                    return {"error": f"Bucket '{bucket_name}' not found"}
+                raise
+            url = s3.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': bucket_name, 'Key': object_name},
+                ExpiresIn=PRESIGNED_URL_EXPIRY
+            )
+            
+            return {
+                "service": "s3",
+                "operation": "download_object",
+                "bucket": bucket_name,
                 "key": object_name,
-                "result": "Object deleted successfully"
+                "download_url": url
+            }
+            
+        except Exception as e:
+            return {"error": f"Failed to create download link: {str(e)}"}
+    
+    def _copy_object(self, command: str) -> Dict[str, Any]:
+        try:
+            match = COPY_OBJECT_RE.search(command)
+            if not match:
+                return {"error": "Please specify: copy file <key> from <source bucket> to <destination bucket>"}
+            key_list, source_bucket, dest_bucket = match.groups()
+            
+            # "copy files a.txt, b.txt from ..." copies several keys at once
+            keys = KEY_SEPARATOR_RE.split(key_list)
+            
+            s3 = self._client('s3')
+            
+            def copy_one(key):
+                """None on success, S3's error code if it refused the copy"""
+                try:
+                    s3.copy_object(Bucket=dest_bucket, Key=key, CopySource={'Bucket': source_bucket, 'Key': key})
+                    return None
+                except ClientError as e:
+                    return e.response['Error']['Code']
+            
+            with ThreadPoolExecutor(max_workers=min(MAX_COPY_WORKERS, len(keys) + 2)) as executor:
+                # The existence checks are independent round-trips, so issue them together,
+                # skipping head_bucket for buckets a recent listing already confirmed
+                checks = [
+                    (executor.submit(s3.head_bucket, Bucket=bucket), f"Bucket '{bucket}' not found")
+                    for bucket in (source_bucket, dest_bucket)
+                    if not self._is_known_bucket(bucket)
+                ]
+                checks.extend(
+                    (executor.submit(s3.head_object, Bucket=source_bucket, Key=key), f"Object '{key}' not found in '{source_bucket}'")
+                    for key in keys
+                )
+                for future, not_found in checks:
+                    try:
+                        future.result()
+                    except ClientError as e:
+                        if e.response['Error']['Code'] in ('404', 'NoSuchBucket', 'NoSuchKey'):
+                            return {"error": not_found}
+                        raise
+                
+                try:
+                    outcomes = list(zip(keys, executor.map(copy_one, keys)))
+                finally:
+                    # Even a partial failure may have written keys
+                    self._invalidate_listing(dest_bucket)
+            
+            copied = [key for key, code in outcomes if code is None]
+            failed = {key: code for key, code in outcomes if code is not None}
+            if failed:
+                reasons = ", ".join(f"{key} ({code})" for key, code in failed.items())
+                return {
+                    "error": f"Copied {', '.join(copied) or 'nothing'}; failed to copy {reasons}",
+                    "copied": copied,
+                    "failed": failed
+                }
+            
+            return {
+                "service": "s3",
+                "operation": "copy_object",
+                "source_bucket": source_bucket,
+                "dest_bucket": dest_bucket,
+                "key": ", ".join(keys),
+                "result": "Object copied successfully" if len(keys) == 1 else f"{len(keys)} objects copied successfully"
             }
             
         except Exception as e:
-            return {"error": f"Failed to delete object: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Failed to copy object: {str(e)}"}
\ No newline at end of file
@@ -1,9 +1,12 @@
 """
 VPC Service Agent
 """
-from .base_agent import BaseAgent
+from .base_agent import BaseAgent, compile_keywords
 from typing import Dict, List, Any
 
+VPC_KEYWORDS = ("vpc", "subnet", "network", "route", "gateway")
+VPC_KEYWORD_RE = compile_keywords(VPC_KEYWORDS)
+
 class VPCAgent(BaseAgent):
     def get_service_name(self) -> str:
         return "vpc"
@@ -18,8 +21,7 @@ class VPCAgent(BaseAgent):
         ]
     
     def can_handle(self, command: str) -> bool:
-        vpc_keywords = ["vpc", "subnet", "network", "route", "gateway"]
-        return any(keyword in command.lower() for keyword in vpc_keywords)
+        return VPC_KEYWORD_RE.search(command) is not None
     
     def execute(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         command_lower = command.lower()
@@ -40,16 +42,12 @@ class VPCAgent(BaseAgent):
             return {"error": str(e)}
     
     def _list_vpcs(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.describe_vpcs()
         
         vpcs = []
         for vpc in response['Vpcs']:
-            name = "Unnamed"
-            if 'Tags' in vpc:
-                for tag in vpc['Tags']:
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
+            name = self._name_from_tags(vpc)
             
             vpcs.append({
                 "id": vpc['VpcId'],
@@ -67,16 +65,12 @@ class VPCAgent(BaseAgent):
         }
     
     def _list_subnets(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.describe_subnets()
         
         subnets = []
         for subnet in response['Subnets']:
-            name = "Unnamed"
-            if 'Tags' in subnet:
-                for tag in subnet['Tags']:
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
+            name = self._name_from_tags(subnet)
             
             subnets.append({
                 "id": subnet['SubnetId'],
@@ -95,16 +89,12 @@ class VPCAgent(BaseAgent):
         }
     
     def _list_route_tables(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.describe_route_tables()
         
         route_tables = []
         for rt in response['RouteTables']:
-            name = "Unnamed"
-            if 'Tags' in rt:
-                for tag in rt['Tags']:
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
+            name = self._name_from_tags(rt)
             
             route_tables.append({
                 "id": rt['RouteTableId'],
@@ -121,16 +111,12 @@ class VPCAgent(BaseAgent):
         }
     
     def _list_internet_gateways(self) -> Dict[str, Any]:
-        ec2 = self.session.client('ec2')
+        ec2 = self._client('ec2')
         response = ec2.describe_internet_gateways()
         
         gateways = []
         for igw in response['InternetGateways']:
-            name = "Unnamed"
-            if 'Tags' in igw:
-                for tag in igw['Tags']:
-                    if tag['Key'] == 'Name':
-                        name = tag['Value']
+            name = self._name_from_tags(igw)
             
             attachments = [att['VpcId'] for att in igw.get('Attachments', [])]
             
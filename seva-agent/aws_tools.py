@@ -3,7 +3,40 @@ AWS Service Tools for the Data Analyst Agent
 """
 import boto3
 import json
-from typing import Dict, List, Any, Optional
+import time
+from agents.base_agent import CLIENT_CONFIG
+from typing import Dict, List, Any, Optional, Tuple
+
+# Most objects returned by one list_s3_objects call
+MAX_LISTED_OBJECTS = 1000
+
+# Seconds an account-wide listing is reused for repeated questions
+LISTING_CACHE_TTL = 5
+
+def list_object_summaries(s3, bucket_name: str, prefix: str = "") -> Tuple[List[Dict[str, Any]], bool]:
+    """Up to MAX_LISTED_OBJECTS objects under prefix, and whether the bucket holds more"""
+    paginator = s3.get_paginator('list_objects_v2')
+    # S3 applies the prefix server-side
+    pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, PaginationConfig={'PageSize': 1000})
+    
+    objects = []
+    for page in pages:
+        remaining = MAX_LISTED_OBJECTS - len(objects)
+        contents = page.get('Contents', [])
+        objects.extend(
+            {
+                "key": obj['Key'],
+                "size": obj['Size'],
+                "last_modified": obj['LastModified'].isoformat()
+            }
+            for obj in contents[:remaining]
+        )
+        if len(contents) > remaining:
+            return objects, True
+        if len(objects) == MAX_LISTED_OBJECTS:
+            # Stop at the cap; the page itself says whether another one exists
+            return objects, page.get('IsTruncated', False)
+    return objects, False
 
 class AWSTools:
     """Tools for interacting with AWS services"""
@@ -20,69 +53,92 @@ class AWSTools:
             aws_secret_access_key=aws_secret_access_key,
             region_name=self.region_name
         )
+        
+        # Service clients, created on first use
+        self._clients = {}
+        
+        # Successful listings by name, as (JSON result, time fetched)
+        self._listing_cache = {}
+    
+    def _client(self, service: str):
+        """Return a cached boto3 client, creating it on first use"""
+        client = self._clients.get(service)
+        if client is None:
+            client = self.session.client(service, config=CLIENT_CONFIG)
+            self._clients[service] = client
+        return client
+    
+    def _cached_listing(self, key: str) -> Optional[str]:
+        """A listing fetched within the last LISTING_CACHE_TTL seconds, if any"""
+        cached = self._listing_cache.get(key)
+        if cached and time.monotonic() - cached[1] < LISTING_CACHE_TTL:
+            return cached[0]
+        return None
+    
+    def _store_listing(self, key: str, result: str) -> str:
+        self._listing_cache[key] = (result, time.monotonic())
+        return result
     
     def list_s3_buckets(self) -> str:
         """List all S3 buckets in the account"""
+        cached = self._cached_listing('s3_buckets')
+        if cached is not None:
+            return cached
+        
         try:
-            s3 = self.session.client('s3')
+            s3 = self._client('s3')
             response = s3.list_buckets()
             buckets = [bucket['Name'] for bucket in response['Buckets']]
-            return json.dumps({"buckets": buckets})
+            return self._store_listing('s3_buckets', json.dumps({"buckets": buckets}))
         except Exception as e:
             return json.dumps({"error": str(e)})
     
     def list_s3_objects(self, bucket_name: str, prefix: str = "") -> str:
         """List objects in an S3 bucket with optional prefix"""
         try:
-            s3 = self.session.client('s3')
-            response = s3.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-            
-            if 'Contents' in response:
-                objects = [
-                    {
-                        "key": obj['Key'],
-                        "size": obj['Size'],
-                        "last_modified": obj['LastModified'].isoformat()
-                    }
-                    for obj in response['Contents']
-                ]
-                return json.dumps({"objects": objects})
-            else:
-                return json.dumps({"objects": []})
+            objects, truncated = list_object_summaries(self._client('s3'), bucket_name, prefix)
+            return json.dumps({"objects": objects, "truncated": truncated})
         except Exception as e:
             return json.dumps({"error": str(e)})
     
     def list_ec2_instances(self) -> str:
         """List EC2 instances in the account"""
+        cached = self._cached_listing('ec2_instances')
+        if cached is not None:
+            return cached
+        
         try:
-            ec2 = self.session.client('ec2')
-            response = ec2.describe_instances()
+            ec2 = self._client('ec2')
+            paginator = ec2.get_paginator('describe_instances')
+            pages = paginator.paginate(PaginationConfig={'PageSize': 1000})
             
+            # Only the fields below are kept, so each page is reduced as it arrives
             instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    name = "Unnamed"
-                    if 'Tags' in instance:
-                        for tag in instance['Tags']:
-                            if tag['Key'] == 'Name':
-                                name = tag['Value']
+            for page in pages:
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        name = next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), "Unnamed")
                     
-                    instances.append({
-                        "id": instance['InstanceId'],
-                        "name": name,
-                        "type": instance['InstanceType'],
-                        "state": instance['State']['Name'],
-                        "public_ip": instance.get('PublicIpAddress', 'None')
-                    })
+                        instances.append({
+                            "id": instance['InstanceId'],
+                            "name": name,
+                            "type": instance['InstanceType'],
+                            "state": instance['State']['Name'],
+                            "public_ip": instance.get('PublicIpAddress', 'None')
+                        })
             
-            return json.dumps({"instances": instances})
+            return self._store_listing('ec2_instances', json.dumps({"instances": instances}))
         except Exception as e:
             return json.dumps({"error": str(e)})
     
     def list_lambda_functions(self) -> str:
         """List Lambda functions in the account"""
+        cached = self._cached_listing('lambda_functions')
+        if cached is not None:
+            return cached
+        
         try:
-            lambda_client = self.session.client('lambda')
+            lambda_client = self._client('lambda')
             response = lambda_client.list_functions()
             
             functions = [
@@ -95,14 +151,18 @@ class AWSTools:
                 for function in response['Functions']
             ]
             
-            return json.dumps({"functions": functions})
+            return self._store_listing('lambda_functions', json.dumps({"functions": functions}))
         except Exception as e:
             return json.dumps({"error": str(e)})
     
     def list_iam_users(self) -> str:
         """List IAM users in the account"""
+        cached = self._cached_listing('iam_users')
+        if cached is not None:
+            return cached
+        
         try:
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             response = iam.list_users()
             
             users = [
@@ -115,14 +175,14 @@ class AWSTools:
                 for user in response['Users']
             ]
             
-            return json.dumps({"users": users})
+            return self._store_listing('iam_users', json.dumps({"users": users}))
         except Exception as e:
             return json.dumps({"error": str(e)})
     
     def describe_rds_instances(self) -> str:
         """Describe RDS database instances"""
         try:
-            rds = self.session.client('rds')
+            rds = self._client('rds')
             response = rds.describe_db_instances()
             
             instances = [
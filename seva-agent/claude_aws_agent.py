@@ -3,14 +3,21 @@ Claude AWS Agent - Claude generates and executes AWS CLI commands
 """
 import json
 import boto3
+from agents.base_agent import CLIENT_CONFIG
+from functools import lru_cache
 import subprocess
 import re
+import threading
+import time
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 
+# Only the first tagged command in a reply is executed, so search stops there
+AWS_COMMAND_RE = re.compile(r'<aws_command>(.*?)</aws_command>')
+
 app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
@@ -24,19 +31,26 @@ def get_aws_credentials():
         result = subprocess.run(['aws', 'configure', 'get', 'region'], capture_output=True, text=True)
         region = result.stdout.strip() or 'us-east-1'
         return access_key, secret_key, region
-    except:
+    except (OSError, subprocess.SubprocessError):
         return None, None, None
 
 access_key, secret_key, region = get_aws_credentials()
 
+session = None
 if access_key and secret_key:
     session = boto3.Session(aws_access_key_id=access_key, aws_secret_access_key=secret_key, region_name=region)
-    try:
-        bedrock = session.client('bedrock-runtime')
-        AWS_WORKING = True
-    except Exception as e:
-        AWS_WORKING = False
-else:
+
+# One configured client per service, reused across requests
+@lru_cache(maxsize=None)
+def get_client(service):
+    if session is None:
+        raise RuntimeError("AWS credentials are not configured; run 'aws configure'")
+    return session.client(service, config=CLIENT_CONFIG)
+
+try:
+    bedrock = get_client('bedrock-runtime')
+    AWS_WORKING = True
+except Exception as e:
     AWS_WORKING = False
 
 def execute_aws_command(command):
@@ -44,7 +58,7 @@ def execute_aws_command(command):
     try:
         if "s3 ls" in command and "s3://" not in command:
             # List S3 buckets
-            s3 = session.client('s3')
+            s3 = get_client('s3')
             response = s3.list_buckets()
             output = ""
             for bucket in response['Buckets']:
@@ -54,7 +68,7 @@ def execute_aws_command(command):
         elif "s3 ls s3://" in command:
             # List S3 objects
             bucket_name = command.split('s3://')[1].rstrip('/')
-            s3 = session.client('s3')
+            s3 = get_client('s3')
             response = s3.list_objects_v2(Bucket=bucket_name)
             if 'Contents' in response:
                 output = ""
@@ -67,21 +81,21 @@ def execute_aws_command(command):
                 return "Bucket is empty"
         elif "ec2 describe-instances" in command:
             # List EC2 instances
-            ec2 = session.client('ec2')
-            response = ec2.describe_instances()
+            ec2 = get_client('ec2')
+            paginator = ec2.get_paginator('describe_instances')
             output = ""
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    output += f"{instance['InstanceId']} {instance['State']['Name']} {instance['InstanceType']}\n"
+            for page in paginator.paginate(PaginationConfig={'PageSize': 1000}):
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        output += f"{instance['InstanceId']} {instance['State']['Name']} {instance['InstanceType']}\n"
             return output
         else:
             return f"Command not supported via boto3: {command}"
     except Exception as e:
         return f"Execution error: {str(e)}"
 
-def call_claude_with_tools(user_message):
-    """Call Claude with AWS tool capability"""
-    system_prompt = """You are SevaAI, an AWS assistant. When users ask about AWS resources, you should:
+# Instructs Claude to answer with one tagged, read-only CLI command plus a short explanation
+SYSTEM_PROMPT = """You are SevaAI, an AWS assistant. When users ask about AWS resources, you should:
 
 1. Generate the appropriate AWS CLI command
 2. Wrap the command in <aws_command> tags
@@ -98,21 +112,53 @@ This command lists all S3 buckets in your account."
 Available AWS services: S3, EC2, Lambda, IAM, RDS, CloudWatch, etc.
 Only suggest safe read-only commands unless explicitly asked for modifications."""
 
+# Replies are one command and a few sentences, so a small, deterministic budget is enough
+CLAUDE_MAX_TOKENS = 1024
+
+# Seconds a reply is reused for a repeated message, and how many replies are kept
+REPLY_CACHE_TTL = 300
+REPLY_CACHE_SIZE = 256
+
+# Normalized message -> (reply, time it was generated)
+_reply_cache = {}
+_reply_cache_lock = threading.Lock()
+
+def _ask_claude(user_message):
+    """Claude's reply to one whitespace-normalized message"""
+    body = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": CLAUDE_MAX_TOKENS,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": user_message}],
+        "system": SYSTEM_PROMPT
+    })
+    
+    response = bedrock.invoke_model(
+        modelId="us.anthropic.claude-3-5-sonnet-20241022-v2:0",
+        body=body
+    )
+    
+    result = json.loads(response["body"].read())
+    return result["content"][0]["text"]
+
+def call_claude_with_tools(user_message):
+    """Call Claude with AWS tool capability"""
     try:
-        body = json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 2000,
-            "messages": [{"role": "user", "content": user_message}],
-            "system": system_prompt
-        })
-        
-        response = bedrock.invoke_model(
-            modelId="us.anthropic.claude-3-5-sonnet-20241022-v2:0",
-            body=body
-        )
+        # Replies are deterministic, so a repeated request reuses the generated command for a
+        # few minutes; the command itself is still executed fresh every time
+        cache_key = ' '.join(user_message.split())
+        cached = _reply_cache.get(cache_key)
+        if cached and time.monotonic() - cached[1] < REPLY_CACHE_TTL:
+            return cached[0]
         
-        result = json.loads(response["body"].read())
-        return result["content"][0]["text"]
+        # Failures raise before this point, so they are never cached
+        reply = _ask_claude(cache_key)
+        with _reply_cache_lock:
+            if len(_reply_cache) >= REPLY_CACHE_SIZE:
+                # Drop the oldest entry; dicts keep insertion order
+                _reply_cache.pop(next(iter(_reply_cache)), None)
+            _reply_cache[cache_key] = (reply, time.monotonic())
+        return reply
     except Exception as e:
         return f"Claude error: {str(e)}"
 
@@ -188,11 +234,11 @@ async def chat(request: ChatRequest):
     claude_response = call_claude_with_tools(user_message)
     
     # Look for AWS commands in Claude's response
-    aws_commands = re.findall(r'<aws_command>(.*?)</aws_command>', claude_response)
+    aws_command = AWS_COMMAND_RE.search(claude_response)
     
-    if aws_commands:
+    if aws_command:
         # Execute the AWS command
-        command = aws_commands[0].strip()
+        command = aws_command.group(1).strip()
         command_output = execute_aws_command(command)
         
         # Combine Claude's explanation with command output
@@ -3,7 +3,50 @@ Diagnostic Agent - Analyze IAM and S3 permissions
 """
 import boto3
 import json
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
+from agents.base_agent import CLIENT_CONFIG
+
+def _probe_list_buckets(s3, bucket: str) -> Dict[str, Any]:
+    response = s3.list_buckets()
+    return {'success': True, 'count': len(response['Buckets'])}
+
+def _probe_head_bucket(s3, bucket: str) -> Dict[str, Any]:
+    s3.head_bucket(Bucket=bucket)
+    return {'success': True}
+
+def _probe_bucket_location(s3, bucket: str) -> Dict[str, Any]:
+    location = s3.get_bucket_location(Bucket=bucket)
+    return {'success': True, 'region': location.get('LocationConstraint')}
+
+def _probe_list_objects(s3, bucket: str) -> Dict[str, Any]:
+    response = s3.list_objects_v2(Bucket=bucket, MaxKeys=1)
+    return {'success': True, 'has_contents': 'Contents' in response}
+
+def _probe_bucket_policy(s3, bucket: str) -> Dict[str, Any]:
+    try:
+        s3.get_bucket_policy(Bucket=bucket)
+        return {'success': True, 'has_policy': True}
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchBucketPolicy':
+            return {'success': True, 'has_policy': False}
+        raise
+
+def _run_probe(probe, s3, bucket: str) -> Dict[str, Any]:
+    try:
+        return probe(s3, bucket)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+# Display order of the S3 permission tests
+S3_PROBES = [
+    ('list_buckets', _probe_list_buckets),
+    ('head_bucket', _probe_head_bucket),
+    ('get_bucket_location', _probe_bucket_location),
+    ('list_objects', _probe_list_objects),
+    ('get_bucket_policy', _probe_bucket_policy),
+]
 
 def diagnose_permissions(session: boto3.Session) -> Dict[str, Any]:
     """Comprehensive permission diagnosis"""
@@ -11,7 +54,7 @@ def diagnose_permissions(session: boto3.Session) -> Dict[str, Any]:
     
     # 1. Check current identity
     try:
-        sts = session.client('sts')
+        sts = session.client('sts', config=CLIENT_CONFIG)
         identity = sts.get_caller_identity()
         results['identity'] = {
             'user_id': identity.get('UserId'),
@@ -22,57 +65,23 @@ def diagnose_permissions(session: boto3.Session) -> Dict[str, Any]:
     except Exception as e:
         results['identity'] = {'error': str(e)}
     
-    # 2. Test basic S3 permissions
-    s3_tests = {}
-    s3 = session.client('s3')
-    
-    # Test list buckets
-    try:
-        response = s3.list_buckets()
-        s3_tests['list_buckets'] = {'success': True, 'count': len(response['Buckets'])}
-    except Exception as e:
-        s3_tests['list_buckets'] = {'success': False, 'error': str(e)}
-    
-    # Test specific bucket operations
+    # 2. Test basic S3 permissions (independent calls, so run them concurrently)
+    s3 = session.client('s3', config=CLIENT_CONFIG)
     test_bucket = 'tar-books25'
     
-    # Test head bucket
-    try:
-        s3.head_bucket(Bucket=test_bucket)
-        s3_tests['head_bucket'] = {'success': True}
-    except Exception as e:
-        s3_tests['head_bucket'] = {'success': False, 'error': str(e)}
-    
-    # Test get bucket location
-    try:
-        location = s3.get_bucket_location(Bucket=test_bucket)
-        s3_tests['get_bucket_location'] = {'success': True, 'region': location.get('LocationConstraint')}
-    except Exception as e:
-        s3_tests['get_bucket_location'] = {'success': False, 'error': str(e)}
-    
-    # Test list objects
-    try:
-        response = s3.list_objects_v2(Bucket=test_bucket, MaxKeys=1)
-        s3_tests['list_objects'] = {'success': True, 'has_contents': 'Contents' in response}
-    except Exception as e:
-        s3_tests['list_objects'] = {'success': False, 'error': str(e)}
-    
-    # Test get bucket policy
-    try:
-        policy = s3.get_bucket_policy(Bucket=test_bucket)
-        s3_tests['get_bucket_policy'] = {'success': True, 'has_policy': True}
-    except Exception as e:
-        if 'NoSuchBucketPolicy' in str(e):
-            s3_tests['get_bucket_policy'] = {'success': True, 'has_policy': False}
-        else:
-            s3_tests['get_bucket_policy'] = {'success': False, 'error': str(e)}
+    with ThreadPoolExecutor(max_workers=len(S3_PROBES)) as executor:
+        futures = [
+            (name, executor.submit(_run_probe, probe, s3, test_bucket))
+            for name, probe in S3_PROBES
+        ]
+        s3_tests = {name: future.result() for name, future in futures}
     
     results['s3_permissions'] = s3_tests
     
     # 3. Test IAM permissions (if not root)
     if results['identity'].get('type') == 'iam_user':
         iam_tests = {}
-        iam = session.client('iam')
+        iam = session.client('iam', config=CLIENT_CONFIG)
         
         try:
             username = results['identity']['arn'].split(':user/')[1]
@@ -177,7 +186,7 @@ if __name__ == "__main__":
             result = subprocess.run(['aws', 'configure', 'get', 'region'], capture_output=True, text=True)
             region = result.stdout.strip() or 'us-east-1'
             return access_key, secret_key, region
-        except:
+        except (OSError, subprocess.SubprocessError):
             return None, None, None
     
     access_key, secret_key, region = get_aws_credentials()
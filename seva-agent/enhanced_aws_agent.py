@@ -3,14 +3,22 @@ Enhanced AWS Agent with comprehensive service support
 Supports S3, EC2, Lambda, IAM, RDS, CloudWatch, VPC, Route53, CloudFormation, and more
 """
 import os
-import json
 import boto3
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from enhanced_aws_tools import EnhancedAWSTools
+from agents.base_agent import CLIENT_CONFIG
+
+# Bedrock request/response bodies go through orjson when it is installed
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
 
 # Initialize FastAPI app
 app = FastAPI(title="SevaAI Enhanced AWS Agent")
@@ -31,13 +39,16 @@ aws_tools = EnhancedAWSTools(
     region_name=os.environ.get("AWS_REGION", "us-east-1")
 )
 
-# Initialize Bedrock client
-bedrock_runtime = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=os.environ.get("AWS_REGION", "us-east-1"),
-    aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY")
-)
+# Bedrock client, created on the first chat request rather than at import
+@lru_cache(maxsize=1)
+def get_bedrock_runtime():
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=os.environ.get("AWS_REGION", "us-east-1"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+        config=CLIENT_CONFIG
+    )
 
 # Enhanced system prompt
 SYSTEM_PROMPT = """
@@ -208,6 +219,18 @@ TOOLS = {
     }
 }
 
+# Message roles forwarded to Claude; anything else in the history is dropped
+CLAUDE_ROLES = frozenset({"user", "assistant"})
+
+# Upper bound on tool calls executed concurrently for one chat turn
+MAX_TOOL_WORKERS = 8
+
+# Tools with these prefixes only read state, so neighbouring calls may overlap
+READ_ONLY_TOOL_PREFIXES = ("list_", "describe_", "get_")
+
+# The tool set is static, so the system prompt only needs rendering once
+RENDERED_SYSTEM_PROMPT = SYSTEM_PROMPT.format(tools=", ".join(TOOLS.keys()))
+
 # Pydantic models
 class Message(BaseModel):
     role: str
@@ -232,10 +255,11 @@ def parse_tool_calls(content: str) -> List[Dict[str, Any]]:
         
         for line in lines:
             line = line.strip()
-            if line.startswith('Tool:'):
+            tool_name = line.removeprefix('Tool:')
+            if tool_name != line:
                 if current_tool:
                     tool_calls.append({"name": current_tool, "parameters": current_params})
-                current_tool = line.replace('Tool:', '').strip()
+                current_tool = tool_name.strip()
                 current_params = {}
             elif ':' in line and current_tool:
                 key, value = line.split(':', 1)
@@ -246,6 +270,34 @@ def parse_tool_calls(content: str) -> List[Dict[str, Any]]:
     
     return tool_calls
 
+def execute_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[str]:
+    """Results in call order; runs of read-only calls overlap, state changes run alone in sequence"""
+    results = []
+    pending_reads = []
+    
+    def flush_reads():
+        if len(pending_reads) == 1:
+            call = pending_reads[0]
+            results.append(execute_tool(call["name"], call.get("parameters", {})))
+        elif pending_reads:
+            with ThreadPoolExecutor(max_workers=min(len(pending_reads), MAX_TOOL_WORKERS)) as executor:
+                results.extend(executor.map(
+                    lambda call: execute_tool(call["name"], call.get("parameters", {})),
+                    pending_reads
+                ))
+        pending_reads.clear()
+    
+    for call in tool_calls:
+        if call["name"].startswith(READ_ONLY_TOOL_PREFIXES):
+            pending_reads.append(call)
+        else:
+            # A create/delete/start/stop/invoke must see every earlier call finished
+            flush_reads()
+            results.append(execute_tool(call["name"], call.get("parameters", {})))
+    flush_reads()
+    
+    return results
+
 def execute_tool(tool_name: str, parameters: Dict[str, Any]) -> str:
     """Execute a tool with given parameters"""
     if tool_name not in TOOLS:
@@ -486,38 +538,36 @@ async def chat(request: ChatRequest):
     """Enhanced chat endpoint with tool execution"""
     try:
         # Format messages for Claude
-        formatted_messages = []
-        for msg in request.messages:
-            if msg.role in ["user", "assistant"]:
-                formatted_messages.append({"role": msg.role, "content": msg.content})
+        formatted_messages = [
+            {"role": msg.role, "content": msg.content}
+            for msg in request.messages
+            if msg.role in CLAUDE_ROLES
+        ]
         
         # Create Claude request
-        tools_list = ", ".join(TOOLS.keys())
-        system_prompt = SYSTEM_PROMPT.format(tools=tools_list)
-        
         body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 4096,
             "temperature": 0.7,
-            "system": system_prompt,
+            "system": RENDERED_SYSTEM_PROMPT,
             "messages": formatted_messages
         }
         
         # Call Bedrock
-        response = bedrock_runtime.invoke_model(
+        response = get_bedrock_runtime().invoke_model(
             modelId="anthropic.claude-3-5-sonnet-20241022-v2:0",
-            body=json.dumps(body)
+            body=_json_impl.dumps(body)
         )
         
-        response_body = json.loads(response["body"].read().decode("utf-8"))
+        response_body = _json_impl.loads(response["body"].read())
         content = response_body.get("content", [{"text": "No response generated"}])[0]["text"]
         
         # Parse and execute any tool calls
         tool_calls = parse_tool_calls(content)
         tool_results = []
         
-        for tool_call in tool_calls:
-            result = execute_tool(tool_call["name"], tool_call.get("parameters", {}))
+        # Consecutive read-only calls overlap; anything that changes state keeps its place in order
+        for tool_call, result in zip(tool_calls, execute_tool_calls(tool_calls)):
             tool_results.append(f"Tool: {tool_call['name']}\\nResult: {result}")
         
         # Append tool results to response
@@ -4,6 +4,9 @@ Comprehensive coverage of AWS services including S3, EC2, Lambda, IAM, RDS, Clou
 """
 import boto3
 import json
+import threading
+from agents.base_agent import CLIENT_CONFIG
+from aws_tools import list_object_summaries
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
@@ -22,13 +25,28 @@ class EnhancedAWSTools:
             aws_secret_access_key=aws_secret_access_key,
             region_name=self.region_name
         )
+        
+        # Service clients, created on first use; tools may run on several threads at once
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+    
+    def _client(self, service: str):
+        """Return a cached boto3 client, creating it on first use"""
+        client = self._clients.get(service)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(service)
+                if client is None:
+                    client = self.session.client(service, config=CLIENT_CONFIG)
+                    self._clients[service] = client
+        return client
     
     # ==================== S3 OPERATIONS ====================
     
     def list_s3_buckets(self) -> str:
         """List all S3 buckets in the account"""
         try:
-            s3 = self.session.client('s3')
+            s3 = self._client('s3')
             response = s3.list_buckets()
             buckets = [bucket['Name'] for bucket in response['Buckets']]
             return json.dumps({"buckets": buckets})
@@ -38,7 +56,7 @@ class EnhancedAWSTools:
     def create_s3_bucket(self, bucket_name: str, region: str = None) -> str:
         """Create a new S3 bucket"""
         try:
-            s3 = self.session.client('s3')
+            s3 = self._client('s3')
             if region and region != 'us-east-1':
                 s3.create_bucket(
                     Bucket=bucket_name,
@@ -53,7 +71,7 @@ class EnhancedAWSTools:
     def delete_s3_bucket(self, bucket_name: str) -> str:
         """Delete an S3 bucket (must be empty)"""
         try:
-            s3 = self.session.client('s3')
+            s3 = self._client('s3')
             s3.delete_bucket(Bucket=bucket_name)
             return json.dumps({"success": f"Bucket {bucket_name} deleted successfully"})
         except Exception as e:
@@ -62,21 +80,8 @@ class EnhancedAWSTools:
     def list_s3_objects(self, bucket_name: str, prefix: str = "") -> str:
         """List objects in an S3 bucket with optional prefix"""
         try:
-            s3 = self.session.client('s3')
-            response = s3.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-            
-            if 'Contents' in response:
-                objects = [
-                    {
-                        "key": obj['Key'],
-                        "size": obj['Size'],
-                        "last_modified": obj['LastModified'].isoformat()
-                    }
-                    for obj in response['Contents']
-                ]
-                return json.dumps({"objects": objects})
-            else:
-                return json.dumps({"objects": []})
+            objects, truncated = list_object_summaries(self._client('s3'), bucket_name, prefix)
+            return json.dumps({"objects": objects, "truncated": truncated})
         except Exception as e:
             return json.dumps({"error": str(e)})
     
@@ -85,27 +90,26 @@ class EnhancedAWSTools:
     def list_ec2_instances(self) -> str:
         """List EC2 instances in the account"""
         try:
-            ec2 = self.session.client('ec2')
-            response = ec2.describe_instances()
+            ec2 = self._client('ec2')
+            paginator = ec2.get_paginator('describe_instances')
+            pages = paginator.paginate(PaginationConfig={'PageSize': 1000})
             
+            # Only the fields below are kept, so each page is reduced as it arrives
             instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    name = "Unnamed"
-                    if 'Tags' in instance:
-                        for tag in instance['Tags']:
-                            if tag['Key'] == 'Name':
-                                name = tag['Value']
+            for page in pages:
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        name = next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), "Unnamed")
                     
-                    instances.append({
-                        "id": instance['InstanceId'],
-                        "name": name,
-                        "type": instance['InstanceType'],
-                        "state": instance['State']['Name'],
-                        "public_ip": instance.get('PublicIpAddress', 'None'),
-                        "private_ip": instance.get('PrivateIpAddress', 'None'),
-                        "launch_time": instance['LaunchTime'].isoformat()
-                    })
+                        instances.append({
+                            "id": instance['InstanceId'],
+                            "name": name,
+                            "type": instance['InstanceType'],
+                            "state": instance['State']['Name'],
+                            "public_ip": instance.get('PublicIpAddress', 'None'),
+                            "private_ip": instance.get('PrivateIpAddress', 'None'),
+                            "launch_time": instance['LaunchTime'].isoformat()
+                        })
             
             return json.dumps({"instances": instances})
         except Exception as e:
@@ -114,7 +118,7 @@ class EnhancedAWSTools:
     def start_ec2_instance(self, instance_id: str) -> str:
         """Start an EC2 instance"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             response = ec2.start_instances(InstanceIds=[instance_id])
             return json.dumps({"success": f"Instance {instance_id} start initiated"})
         except Exception as e:
@@ -123,7 +127,7 @@ class EnhancedAWSTools:
     def stop_ec2_instance(self, instance_id: str) -> str:
         """Stop an EC2 instance"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             response = ec2.stop_instances(InstanceIds=[instance_id])
             return json.dumps({"success": f"Instance {instance_id} stop initiated"})
         except Exception as e:
@@ -132,7 +136,7 @@ class EnhancedAWSTools:
     def list_security_groups(self) -> str:
         """List EC2 security groups"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             response = ec2.describe_security_groups()
             
             groups = [
@@ -154,7 +158,7 @@ class EnhancedAWSTools:
     def list_lambda_functions(self) -> str:
         """List Lambda functions in the account"""
         try:
-            lambda_client = self.session.client('lambda')
+            lambda_client = self._client('lambda')
             response = lambda_client.list_functions()
             
             functions = [
@@ -175,7 +179,7 @@ class EnhancedAWSTools:
     def invoke_lambda_function(self, function_name: str, payload: dict = None) -> str:
         """Invoke a Lambda function"""
         try:
-            lambda_client = self.session.client('lambda')
+            lambda_client = self._client('lambda')
             response = lambda_client.invoke(
                 FunctionName=function_name,
                 Payload=json.dumps(payload or {})
@@ -189,7 +193,7 @@ class EnhancedAWSTools:
     def get_lambda_logs(self, function_name: str, hours: int = 1) -> str:
         """Get recent Lambda function logs"""
         try:
-            logs_client = self.session.client('logs')
+            logs_client = self._client('logs')
             log_group_name = f"/aws/lambda/{function_name}"
             
             end_time = datetime.utcnow()
@@ -218,7 +222,7 @@ class EnhancedAWSTools:
     def list_iam_users(self) -> str:
         """List IAM users in the account"""
         try:
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             response = iam.list_users()
             
             users = [
@@ -238,7 +242,7 @@ class EnhancedAWSTools:
     def list_iam_roles(self) -> str:
         """List IAM roles in the account"""
         try:
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             response = iam.list_roles()
             
             roles = [
@@ -258,7 +262,7 @@ class EnhancedAWSTools:
     def list_iam_policies(self, scope: str = "Local") -> str:
         """List IAM policies (Local or AWS managed)"""
         try:
-            iam = self.session.client('iam')
+            iam = self._client('iam')
             response = iam.list_policies(Scope=scope)
             
             policies = [
@@ -280,7 +284,7 @@ class EnhancedAWSTools:
     def describe_rds_instances(self) -> str:
         """Describe RDS database instances"""
         try:
-            rds = self.session.client('rds')
+            rds = self._client('rds')
             response = rds.describe_db_instances()
             
             instances = [
@@ -302,7 +306,7 @@ class EnhancedAWSTools:
     def list_rds_snapshots(self) -> str:
         """List RDS snapshots"""
         try:
-            rds = self.session.client('rds')
+            rds = self._client('rds')
             response = rds.describe_db_snapshots(SnapshotType='manual')
             
             snapshots = [
@@ -324,7 +328,7 @@ class EnhancedAWSTools:
     def list_cloudwatch_alarms(self) -> str:
         """List CloudWatch alarms"""
         try:
-            cloudwatch = self.session.client('cloudwatch')
+            cloudwatch = self._client('cloudwatch')
             response = cloudwatch.describe_alarms()
             
             alarms = [
@@ -345,7 +349,7 @@ class EnhancedAWSTools:
     def get_cloudwatch_metrics(self, namespace: str, metric_name: str, hours: int = 24) -> str:
         """Get CloudWatch metrics for a specific metric"""
         try:
-            cloudwatch = self.session.client('cloudwatch')
+            cloudwatch = self._client('cloudwatch')
             
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(hours=hours)
@@ -378,7 +382,7 @@ class EnhancedAWSTools:
     def list_vpcs(self) -> str:
         """List VPCs in the account"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             response = ec2.describe_vpcs()
             
             vpcs = [
@@ -398,7 +402,7 @@ class EnhancedAWSTools:
     def list_subnets(self, vpc_id: str = None) -> str:
         """List subnets, optionally filtered by VPC"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             
             if vpc_id:
                 response = ec2.describe_subnets(Filters=[{'Name': 'vpc-id', 'Values': [vpc_id]}])
@@ -425,7 +429,7 @@ class EnhancedAWSTools:
     def get_cost_and_usage(self, days: int = 30) -> str:
         """Get cost and usage data for the last N days"""
         try:
-            ce = self.session.client('ce')
+            ce = self._client('ce')
             
             end_date = datetime.utcnow().date()
             start_date = end_date - timedelta(days=days)
@@ -462,7 +466,7 @@ class EnhancedAWSTools:
     def list_hosted_zones(self) -> str:
         """List Route 53 hosted zones"""
         try:
-            route53 = self.session.client('route53')
+            route53 = self._client('route53')
             response = route53.list_hosted_zones()
             
             zones = [
@@ -483,7 +487,7 @@ class EnhancedAWSTools:
     def list_cloudformation_stacks(self) -> str:
         """List CloudFormation stacks"""
         try:
-            cf = self.session.client('cloudformation')
+            cf = self._client('cloudformation')
             response = cf.describe_stacks()
             
             stacks = [
@@ -505,7 +509,7 @@ class EnhancedAWSTools:
     def get_account_info(self) -> str:
         """Get AWS account information"""
         try:
-            sts = self.session.client('sts')
+            sts = self._client('sts')
             response = sts.get_caller_identity()
             
             return json.dumps({
@@ -519,7 +523,7 @@ class EnhancedAWSTools:
     def list_regions(self) -> str:
         """List available AWS regions"""
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             response = ec2.describe_regions()
             
             regions = [region['RegionName'] for region in response['Regions']]
@@ -28,7 +28,7 @@ def get_aws_credentials():
         region = result.stdout.strip() or 'us-east-1'
         
         return access_key, secret_key, region
-    except:
+    except (OSError, subprocess.SubprocessError):
         return None, None, None
 
 # Set up AWS with explicit credentials
@@ -23,7 +23,7 @@ def get_aws_credentials():
         result = subprocess.run(['aws', 'configure', 'get', 'region'], capture_output=True, text=True)
         region = result.stdout.strip() or 'us-east-1'
         return access_key, secret_key, region
-    except:
+    except (OSError, subprocess.SubprocessError):
         return None, None, None
 
 access_key, secret_key, region = get_aws_credentials()
@@ -64,11 +64,7 @@ def list_ec2_instances():
         output = "Your EC2 Instances:\n"
         for reservation in response['Reservations']:
             for instance in reservation['Instances']:
-                name = "Unnamed"
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
+                name = next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), "Unnamed")
                 output += f"• {instance['InstanceId']} ({name}) - {instance['State']['Name']}\n"
         return output
     except Exception as e:
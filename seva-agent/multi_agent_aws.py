@@ -4,9 +4,11 @@ Multi-Agent AWS System
 import json
 import boto3
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List
 from orchestrator import AgentOrchestrator
@@ -15,16 +17,19 @@ app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 # Get AWS credentials
+def _aws_configure_get(key: str) -> str:
+    result = subprocess.run(['aws', 'configure', 'get', key], capture_output=True, text=True)
+    return result.stdout.strip()
+
 def get_aws_credentials():
     try:
-        result = subprocess.run(['aws', 'configure', 'get', 'aws_access_key_id'], capture_output=True, text=True)
-        access_key = result.stdout.strip()
-        result = subprocess.run(['aws', 'configure', 'get', 'aws_secret_access_key'], capture_output=True, text=True)
-        secret_key = result.stdout.strip()
-        result = subprocess.run(['aws', 'configure', 'get', 'region'], capture_output=True, text=True)
-        region = result.stdout.strip() or 'us-east-1'
-        return access_key, secret_key, region
-    except:
+        # Each lookup starts its own aws CLI process, so run the three side by side
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            access_key, secret_key, region = executor.map(
+                _aws_configure_get, ('aws_access_key_id', 'aws_secret_access_key', 'region')
+            )
+        return access_key, secret_key, region or 'us-east-1'
+    except (OSError, subprocess.SubprocessError):
         return None, None, None
 
 # Initialize system
@@ -43,10 +48,7 @@ class ChatResponse(BaseModel):
     role: str
     content: str
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    services = orchestrator.get_available_services()
-    
+def render_index(services) -> str:
     services_html = ""
     for service, capabilities in services.items():
         services_html += f"<div style='margin:10px 0;'><b>{service.upper()}:</b> {', '.join(capabilities)}</div>"
@@ -114,17 +116,25 @@ async def root():
     </body></html>
     """
 
+# The agent set is fixed at startup, so the page and service map are built once
+SERVICES = orchestrator.get_available_services()
+INDEX_HTML = render_index(SERVICES)
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    return INDEX_HTML
+
 @app.get("/services")
 async def get_services():
     """Get available services and capabilities"""
-    return orchestrator.get_available_services()
+    return SERVICES
 
 @app.post("/chat")
 async def chat(request: ChatRequest):
     user_message = request.messages[-1].content
     
-    # Route command through orchestrator
-    result = orchestrator.route_command(user_message)
+    # Route command through orchestrator; the boto3/Bedrock calls block, so keep them off the event loop
+    result = await run_in_threadpool(orchestrator.route_command, user_message)
     
     # Format response for display
     formatted_response = orchestrator.format_response(result)
@@ -3,6 +3,10 @@ Nova AWS Agent - Using Amazon Nova Micro LLM
 """
 import json
 import boto3
+from agents.base_agent import CLIENT_CONFIG
+from botocore.exceptions import BotoCoreError
+from functools import lru_cache
+from itertools import islice
 import subprocess
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse, HTMLResponse
@@ -10,6 +14,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 
+# Bedrock request/response bodies go through orjson when it is installed
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
+
 app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
@@ -23,23 +33,31 @@ def get_aws_credentials():
         result = subprocess.run(['aws', 'configure', 'get', 'region'], capture_output=True, text=True)
         region = result.stdout.strip() or 'us-east-1'
         return access_key, secret_key, region
-    except:
+    except (OSError, subprocess.SubprocessError):
         return None, None, None
 
 access_key, secret_key, region = get_aws_credentials()
 session = boto3.Session(aws_access_key_id=access_key, aws_secret_access_key=secret_key, region_name=region)
 
+# One configured client per service, reused across requests
+@lru_cache(maxsize=None)
+def get_client(service):
+    return session.client(service, config=CLIENT_CONFIG)
+
 # Initialize Nova Micro
 try:
-    bedrock = session.client('bedrock-runtime')
+    bedrock = get_client('bedrock-runtime')
     NOVA_AVAILABLE = True
-except:
+except BotoCoreError:
     NOVA_AVAILABLE = False
 
+# Most objects shown for one bucket (a single list_objects_v2 page)
+MAX_LISTED_OBJECTS = 1000
+
 # AWS Functions
 def list_s3_buckets():
     try:
-        s3 = session.client('s3')
+        s3 = get_client('s3')
         response = s3.list_buckets()
         output = "Your S3 Buckets:\n"
         for bucket in response['Buckets']:
@@ -51,14 +69,14 @@ def list_s3_buckets():
 
 def list_s3_objects(bucket_name):
     try:
-        s3 = session.client('s3')
-        response = s3.list_objects_v2(Bucket=bucket_name)
-        if 'Contents' in response:
-            output = f"Objects in {bucket_name}:\n"
-            for obj in response['Contents']:
-                size = f"{obj['Size']} bytes"
-                output += f"• {obj['Key']} ({size})\n"
-            return output
+        s3 = get_client('s3')
+        paginator = s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket_name, PaginationConfig={'PageSize': MAX_LISTED_OBJECTS})
+        # Stop paging once the cap is reached; lines are joined straight from the generator
+        contents = (obj for page in pages for obj in page.get('Contents', ()))
+        lines = "".join(f"• {obj['Key']} ({obj['Size']} bytes)\n" for obj in islice(contents, MAX_LISTED_OBJECTS))
+        if lines:
+            return f"Objects in {bucket_name}:\n" + lines
         else:
             return f"Bucket {bucket_name} is empty"
     except Exception as e:
@@ -66,17 +84,14 @@ def list_s3_objects(bucket_name):
 
 def list_ec2_instances():
     try:
-        ec2 = session.client('ec2')
-        response = ec2.describe_instances()
+        ec2 = get_client('ec2')
+        paginator = ec2.get_paginator('describe_instances')
         output = "Your EC2 Instances:\n"
-        for reservation in response['Reservations']:
-            for instance in reservation['Instances']:
-                name = "Unnamed"
-                if 'Tags' in instance:
-                    for tag in instance['Tags']:
-                        if tag['Key'] == 'Name':
-                            name = tag['Value']
-                output += f"• {instance['InstanceId']} ({name}) - {instance['State']['Name']}\n"
+        for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+            for reservation in page['Reservations']:
+                for instance in reservation['Instances']:
+                    name = next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), "Unnamed")
+                    output += f"• {instance['InstanceId']} ({name}) - {instance['State']['Name']}\n"
         return output
     except Exception as e:
         return f"Error: {str(e)}"
@@ -87,7 +102,7 @@ def call_nova_micro(user_message):
         return "Nova Micro not available"
     
     try:
-        body = json.dumps({
+        body = _json_impl.dumps({
             "messages": [
                 {
                     "role": "user", 
@@ -105,7 +120,7 @@ def call_nova_micro(user_message):
             body=body
         )
         
-        result = json.loads(response["body"].read())
+        result = _json_impl.loads(response["body"].read())
         return result["output"]["message"]["content"][0]["text"]
     except Exception as e:
         return f"Nova error: {str(e)}"
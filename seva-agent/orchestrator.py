@@ -3,8 +3,11 @@ Multi-Agent Orchestrator
 """
 import boto3
 import json
+import re
+import threading
+import time
 from typing import Dict, List, Any, Optional
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, CLIENT_CONFIG
 from agents.s3_agent import S3Agent
 from agents.ec2_agent import EC2Agent
 from agents.lambda_agent import LambdaAgent
@@ -12,11 +15,86 @@ from agents.iam_agent import IAMAgent
 from agents.cloudwatch_agent import CloudWatchAgent
 from agents.vpc_agent import VPCAgent
 
+# Bedrock request/response bodies go through orjson when it is installed
+try:
+    import orjson as _json_impl
+except ImportError:
+    import json as _json_impl
+
+# How long a Nova routing decision is reused, and how many are kept
+ROUTING_CACHE_TTL = 300
+ROUTING_CACHE_SIZE = 1024
+
+# Prompt used when several agents claim the same command
+ROUTING_PROMPT = """
+Command: "{command}"
+
+Available agents and their capabilities:
+{agent_info}
+
+Analyze this command and choose the MOST APPROPRIATE single agent. Respond with ONLY the service name.
+
+Routing Rules:
+- S3 bucket policies, bucket operations, object operations → 's3'
+- IAM user policies, role policies, user management → 'iam' 
+- EC2 instances, security groups → 'ec2'
+- Lambda functions → 'lambda'
+- VPC networks, subnets → 'vpc'
+- CloudWatch alarms, metrics → 'cloudwatch'
+
+Key Context:
+- "bucket policy" = S3 service (not IAM)
+- "user policy" = IAM service
+- "grant s3 permissions" = IAM service (creates policies for users)
+- "list buckets" = S3 service
+
+Choose the agent that directly manages the PRIMARY resource mentioned in the command."""
+
+# Phrasings several agents claim but whose target service is unambiguous,
+# checked in order before asking Nova
+FAST_ROUTES = [
+    (re.compile(r'\bbucket\s+polic(?:y|ies)\b', re.IGNORECASE), "s3"),
+    (re.compile(r'\buser\s+polic(?:y|ies)\b', re.IGNORECASE), "iam"),
+    (re.compile(r'\bgrant\b.*\bpermissions?\b', re.IGNORECASE), "iam"),
+]
+
+# Resource word that marks each service as the primary target of a command
+PRIMARY_RESOURCES = {
+    "s3": "bucket",
+    "iam": "user",
+    "ec2": "instance",
+    "lambda": "function",
+    "vpc": "vpc",
+    "cloudwatch": "alarm",
+}
+
 class AgentOrchestrator:
     def __init__(self, session: boto3.Session):
         self.session = session
         self.agents = self._initialize_agents()
-        self.nova_client = session.client('bedrock-runtime')
+        self._nova_client = None
+        self._route_cache = {}
+        # route_command runs on worker threads; evictions must not interleave
+        self._route_cache_lock = threading.Lock()
+        self._agent_info_cache = {}
+        # Capabilities never change after startup, so split them into words once
+        self._capability_words = {
+            agent.get_service_name(): [tuple(capability.split('_')) for capability in agent.get_capabilities()]
+            for agent in self.agents
+        }
+        # Service list is fixed once agents are built, so the general-query prefix is too
+        self.nova_context = (
+            "Answer in maximum 3 lines. "
+            f"Available AWS services: {list(self.get_available_services().keys())}. "
+            "For AWS operations, suggest specific commands like 'list s3 buckets' or 'list ec2 instances'."
+        )
+    
+    @property
+    def nova_client(self):
+        """Bedrock runtime client, created on the first Nova call"""
+        if self._nova_client is None:
+            self._nova_client = self.session.client('bedrock-runtime', config=CLIENT_CONFIG)
+        return self._nova_client
     
     def _initialize_agents(self) -> List[BaseAgent]:
         """Initialize all service agents"""
@@ -54,7 +132,13 @@ class AgentOrchestrator:
             print(f"DEBUG: Single agent {capable_agents[0].get_service_name()} handling command")
             return capable_agents[0].execute(command)
         
-        # Multiple agents can handle it - ask Nova to route
+        # Multiple agents can handle it - well-known phrasings skip the Bedrock call
+        agent = self._fast_route(command, capable_agents)
+        if agent:
+            print(f"DEBUG: Fast-path routing to service: '{agent.get_service_name()}'")
+            return agent.execute(command)
+        
+        # Otherwise ask Nova to route
         print(f"DEBUG: Multiple agents, using Nova routing")
         return self._nova_route_command(command, capable_agents)
     
@@ -72,58 +156,30 @@ class AgentOrchestrator:
         
         return results
     
+    def _fast_route(self, command: str, capable_agents: List[BaseAgent]) -> Optional[BaseAgent]:
+        """Capable agent chosen by the first matching FAST_ROUTES pattern, if any"""
+        for pattern, service in FAST_ROUTES:
+            if pattern.search(command):
+                return next((agent for agent in capable_agents if agent.get_service_name() == service), None)
+        return None
+    
     def _nova_route_command(self, command: str, capable_agents: List[BaseAgent]) -> Dict[str, Any]:
         """Use Nova to intelligently route multi-agent commands"""
         try:
-            agent_info = {}
-            for agent in capable_agents:
-                agent_info[agent.get_service_name()] = agent.get_capabilities()
-            
-            routing_prompt = f"""
-Command: "{command}"
-
-Available agents and their capabilities:
-{json.dumps(agent_info, indent=2)}
-
-Analyze this command and choose the MOST APPROPRIATE single agent. Respond with ONLY the service name.
-
-Routing Rules:
-- S3 bucket policies, bucket operations, object operations → 's3'
-- IAM user policies, role policies, user management → 'iam' 
-- EC2 instances, security groups → 'ec2'
-- Lambda functions → 'lambda'
-- VPC networks, subnets → 'vpc'
-- CloudWatch alarms, metrics → 'cloudwatch'
-
-Key Context:
-- "bucket policy" = S3 service (not IAM)
-- "user policy" = IAM service
-- "grant s3 permissions" = IAM service (creates policies for users)
-- "list buckets" = S3 service
-
-Choose the agent that directly manages the PRIMARY resource mentioned in the command."""
-            
-            body = json.dumps({
-                "messages": [
-                    {
-                        "role": "user", 
-                        "content": [{"text": routing_prompt}]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": 20,
-                    "temperature": 0.0
-                }
-            })
-            
-            response = self.nova_client.invoke_model(
-                modelId="amazon.nova-micro-v1:0",
-                body=body
-            )
-            
-            result = json.loads(response["body"].read())
-            chosen_service = result["output"]["message"]["content"][0]["text"].strip().lower()
-            print(f"DEBUG: Nova chose service: '{chosen_service}'")
+            # Identical commands with the same candidate agents route the same way
+            cache_key = (' '.join(command.lower().split()), tuple(agent.get_service_name() for agent in capable_agents))
+            cached = self._route_cache.get(cache_key)
+            if cached and time.monotonic() - cached[1] < ROUTING_CACHE_TTL:
+                chosen_service = cached[0]
+                print(f"DEBUG: Cached routing to service: '{chosen_service}'")
+            else:
+                chosen_service = self._ask_nova_for_service(command, capable_agents)
+                print(f"DEBUG: Nova chose service: '{chosen_service}'")
+                with self._route_cache_lock:
+                    if len(self._route_cache) >= ROUTING_CACHE_SIZE:
+                        # Drop the oldest entry; dicts keep insertion order
+                        self._route_cache.pop(next(iter(self._route_cache)), None)
+                    self._route_cache[cache_key] = (chosen_service, time.monotonic())
             
             # Find the chosen agent
             for agent in capable_agents:
@@ -138,8 +194,49 @@ Choose the agent that directly manages the PRIMARY resource mentioned in the com
             # Fallback to specificity scoring if Nova routing fails
             return self._score_based_routing(command, capable_agents)
     
+    def _ask_nova_for_service(self, command: str, capable_agents: List[BaseAgent]) -> str:
+        """Ask Nova which of the capable agents should handle the command"""
+        routing_prompt = ROUTING_PROMPT.format(
+            command=command,
+            agent_info=self._agent_info_json(capable_agents)
+        )
+        
+        body = _json_impl.dumps({
+            "messages": [
+                {
+                    "role": "user", 
+                    "content": [{"text": routing_prompt}]
+                }
+            ],
+            "inferenceConfig": {
+                "maxTokens": 20,
+                "temperature": 0.0
+            }
+        })
+        
+        response = self.nova_client.invoke_model(
+            modelId="amazon.nova-micro-v1:0",
+            body=body
+        )
+        
+        result = _json_impl.loads(response["body"].read())
+        return result["output"]["message"]["content"][0]["text"].strip().lower()
+    
+    def _agent_info_json(self, capable_agents: List[BaseAgent]) -> str:
+        """Capabilities block for the routing prompt, rendered once per set of agents"""
+        key = tuple(agent.get_service_name() for agent in capable_agents)
+        rendered = self._agent_info_cache.get(key)
+        if rendered is None:
+            agent_info = {}
+            for agent in capable_agents:
+                agent_info[agent.get_service_name()] = agent.get_capabilities()
+            rendered = json.dumps(agent_info, indent=2)
+            self._agent_info_cache[key] = rendered
+        return rendered
+    
     def _score_based_routing(self, command: str, capable_agents: List[BaseAgent]) -> Dict[str, Any]:
         """Fallback routing using specificity scoring"""
+        command_lower = command.lower()
         scores = []
         
         for agent in capable_agents:
@@ -147,24 +244,15 @@ Choose the agent that directly manages the PRIMARY resource mentioned in the com
             service = agent.get_service_name()
             
             # Primary resource scoring
-            if "bucket" in command.lower() and service == "s3":
-                score += 10
-            elif "user" in command.lower() and service == "iam":
-                score += 10
-            elif "instance" in command.lower() and service == "ec2":
-                score += 10
-            elif "function" in command.lower() and service == "lambda":
-                score += 10
-            elif "vpc" in command.lower() and service == "vpc":
-                score += 10
-            elif "alarm" in command.lower() and service == "cloudwatch":
+            resource = PRIMARY_RESOURCES.get(service)
+            if resource and resource in command_lower:
                 score += 10
             
             # Action scoring
-            capabilities = agent.get_capabilities()
-            for capability in capabilities:
-                if any(word in command.lower() for word in capability.split('_')):
-                    score += 1
+            score += sum(
+                any(word in command_lower for word in words)
+                for words in self._capability_words[service]
+            )
             
             scores.append((score, agent))
         
@@ -177,16 +265,11 @@ Choose the agent that directly manages the PRIMARY resource mentioned in the com
     def _call_nova(self, user_message: str) -> Dict[str, Any]:
         """Call Nova Micro for general questions"""
         try:
-            # Add context about available AWS services
-            services_info = self.get_available_services()
-            context = f"Available AWS services: {list(services_info.keys())}. "
-            context += "For AWS operations, suggest specific commands like 'list s3 buckets' or 'list ec2 instances'."
-            
-            body = json.dumps({
+            body = _json_impl.dumps({
                 "messages": [
                     {
                         "role": "user", 
-                        "content": [{"text": f"Answer in maximum 3 lines. {context} {user_message}"}]
+                        "content": [{"text": f"{self.nova_context} {user_message}"}]
                     }
                 ],
                 "inferenceConfig": {
@@ -200,7 +283,7 @@ Choose the agent that directly manages the PRIMARY resource mentioned in the com
                 body=body
             )
             
-            result = json.loads(response["body"].read())
+            result = _json_impl.loads(response["body"].read())
             return {
                 "service": "nova",
                 "operation": "general_query",
@@ -221,194 +304,216 @@ Choose the agent that directly manages the PRIMARY resource mentioned in the com
         service = result.get("service", "unknown")
         operation = result.get("operation", "unknown")
         
-        # Add agent identifier header
-        agent_header = f"🤖 {service.upper()}Agent responding:\n"
-        
         if service == "nova":
             return f"🌆 NovaAgent responding:\n{result.get('result', 'No response')}"
         
-        elif service == "s3":
-            if operation == "download_object":
-                bucket = result.get("bucket")
-                key = result.get("key")
-                url = result.get("download_url")
-                filename = key.split('/')[-1]  # Get just the filename
-                return f"{agent_header}⬇️ <a href='{url}' download='{filename}' style='color:#ff9900;text-decoration:underline;'>Click to download {filename}</a> from '{bucket}'"
-            
-            elif operation in ["move_object", "copy_object"]:
-                source_bucket = result.get("source_bucket")
-                dest_bucket = result.get("dest_bucket")
-                key = result.get("key")
-                op_type = "Moved" if operation == "move_object" else "Copied"
-                return f"{agent_header}📦 {op_type} '{key}' from '{source_bucket}' to '{dest_bucket}'"
-            
-            elif operation == "list_buckets":
-                buckets = result.get("result", [])
-                if not buckets:
-                    return "No S3 buckets found"
-                
-                response = f"{agent_header}📦 Found {result.get('count', 0)} S3 buckets:\n"
-                for bucket in buckets:
-                    response += f"• {bucket['name']} (created: {bucket['created'][:10]})\n"
-                return response
-            
-            elif operation == "list_objects":
-                objects = result.get("result", [])
-                bucket = result.get("bucket", "unknown")
-                
-                if not objects:
-                    return f"{agent_header}📦 Bucket '{bucket}' is empty"
-                
-                response = f"{agent_header}📁 Found {result.get('count', 0)} objects in '{bucket}':\n"
-                for obj in objects:
-                    size_mb = obj['size'] / 1024 / 1024
-                    response += f"• {obj['key']} ({size_mb:.2f} MB)\n"
-                return response
-        
-        elif service == "ec2":
-            if operation == "list_instances":
-                instances = result.get("result", [])
-                if not instances:
-                    return "No EC2 instances found"
-                
-                response = f"{agent_header}🖥️ Found {result.get('count', 0)} EC2 instances:\n"
-                for instance in instances:
-                    response += f"• {instance['id']} ({instance['name']}) - {instance['state']}\n"
-                return response
-        
-        elif service == "lambda":
-            if operation == "list_functions":
-                functions = result.get("result", [])
-                if not functions:
-                    return "No Lambda functions found"
-                
-                response = f"{agent_header}⚡ Found {result.get('count', 0)} Lambda functions:\n"
-                for func in functions:
-                    response += f"• {func['name']} ({func['runtime']}) - {func['memory']}MB\n"
-                return response
-        
-        elif service == "iam":
-            if operation == "list_users":
-                users = result.get("result", [])
-                if not users:
-                    return "No IAM users found"
-                
-                response = f"{agent_header}👥 Found {result.get('count', 0)} IAM users:\n"
-                for user in users:
-                    response += f"• {user['name']} (created: {user['created'][:10]})\n"
-                return response
-            elif operation == "list_roles":
-                roles = result.get("result", [])
-                response = f"{agent_header}🔐 Found {result.get('count', 0)} IAM roles:\n"
-                for role in roles:
-                    response += f"• {role['name']}\n"
-                return response
-            elif operation == "grant_s3_permissions":
-                return f"{agent_header}✅ {result.get('result', 'S3 permissions granted')}"
-        
-        elif service == "cloudwatch":
-            if operation == "list_alarms":
-                alarms = result.get("result", [])
-                if not alarms:
-                    return "No CloudWatch alarms found"
-                
-                response = f"{agent_header}🚨 Found {result.get('count', 0)} CloudWatch alarms:\n"
-                for alarm in alarms:
-                    response += f"• {alarm['name']} - {alarm['state']}\n"
-                return response
+        # Add agent identifier header
+        agent_header = f"🤖 {service.upper()}Agent responding:\n"
         
-        elif service == "vpc":
-            if operation == "list_vpcs":
-                vpcs = result.get("result", [])
-                if not vpcs:
-                    return "No VPCs found"
-                
-                response = f"{agent_header}🌐 Found {result.get('count', 0)} VPCs:\n"
-                for vpc in vpcs:
-                    default = " (default)" if vpc['is_default'] else ""
-                    response += f"• {vpc['id']} ({vpc['name']}) - {vpc['cidr']}{default}\n"
-                return response
-            elif operation == "list_subnets":
-                subnets = result.get("result", [])
-                response = f"{agent_header}🔗 Found {result.get('count', 0)} subnets:\n"
-                for subnet in subnets:
-                    response += f"• {subnet['id']} ({subnet['name']}) - {subnet['cidr']} in {subnet['az']}\n"
-                return response
+        formatter = RESPONSE_FORMATTERS.get((service, operation))
+        if formatter:
+            return formatter(result, agent_header)
         
+        # Default formatting
+        return f"{agent_header}✅ {operation}: {result.get('result', 'Success')}"
 
-        
-        elif service == "s3" and operation == "get_bucket_size":
-            bucket = result.get("bucket")
-            stats = result.get("result", {})
-            size = stats.get('total_size_gb', 'Unknown')
-            count = stats.get('object_count', 'Unknown')
-            if isinstance(size, str) and "Access denied" in size:
-                return f"{agent_header}❌ Cannot access bucket '{bucket}': {stats.get('error', 'Permission denied')}"
-            return f"{agent_header}📊 Bucket '{bucket}' size: {size} GB ({count} objects)"
-        
-        elif service == "s3" and operation == "analyze_storage_class":
-            bucket = result.get("bucket")
-            stats = result.get("result", {})
-            total = result.get("total_objects", 0)
-            
-            if not stats:
-                return f"{agent_header}📉 No objects found in '{bucket}'"
-            
-            response = f"{agent_header}📉 Storage analysis for '{bucket}' ({total} objects):\n"
-            for storage_class, data in stats.items():
-                size_mb = data['size'] / (1024 * 1024)
-                response += f"• {storage_class}: {data['count']} objects ({size_mb:.2f} MB)\n"
-            return response
-        
-        elif service == "s3" and operation == "get_bucket_info":
-            bucket = result.get("bucket")
-            info = result.get("result", {})
-            return f"{agent_header}📝 Bucket '{bucket}' info:\n• Region: {info.get('region')}\n• Has Policy: {info.get('has_policy')}\n• Owner: {info.get('owner')}"
-        
-        elif service == "s3" and operation == "test_bucket_access":
-            buckets = result.get("result", [])
-            accessible = [b for b in buckets if b.get('accessible')]
-            
-            response = f"{agent_header}🔍 Bucket access test ({len(accessible)} accessible out of {len(buckets)}):\n"
-            for bucket in buckets:
-                status = "✅" if bucket.get('accessible') else "❌"
-                response += f"{status} {bucket['name']}\n"
-            return response
-        
-        elif service == "s3" and operation == "get_bucket_policy":
-            bucket = result.get("bucket")
-            policy_info = result.get("result", {})
-            
-            if not policy_info.get("has_policy"):
-                return f"{agent_header}📜 Bucket '{bucket}' has no policy configured"
-            
-            policy = policy_info.get("policy", {})
-            statements = policy.get("Statement", [])
-            
-            response = f"{agent_header}📜 Bucket '{bucket}' policy ({len(statements)} statements):\n"
-            for i, stmt in enumerate(statements, 1):
-                effect = stmt.get('Effect', 'Unknown')
-                actions = stmt.get('Action', [])
-                if isinstance(actions, str):
-                    actions = [actions]
-                response += f"• Statement {i}: {effect} - {', '.join(actions[:3])}{'...' if len(actions) > 3 else ''}\n"
-            
-            return response
-        
-        elif service == "s3" and operation == "delete_object":
-            bucket = result.get("bucket")
-            key = result.get("key")
-            return f"{agent_header}🗑️ Deleted '{key}' from bucket '{bucket}'"
-        
-        elif service == "s3" and operation in ["upload_file_to_s3", "download_file_from_s3"]:
-            bucket = result.get("bucket")
-            key = result.get("key")
-            local_path = result.get("local_path")
-            if operation == "upload_file_to_s3":
-                return f"{agent_header}⬆️ Uploaded '{key}' from {local_path} to bucket '{bucket}'"
-            else:
-                return f"{agent_header}⬇️ Downloaded '{key}' from bucket '{bucket}' to {local_path}"
-        
 
-        # Default formatting
-        return f"{agent_header}✅ {operation}: {result.get('result', 'Success')}"
\ No newline at end of file
+# Response formatters: each takes the agent result and the agent header line
+
+def _format_download_object(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    key = result.get("key")
+    url = result.get("download_url")
+    filename = key.split('/')[-1]  # Get just the filename
+    return f"{agent_header}⬇️ <a href='{url}' download='{filename}' style='color:#ff9900;text-decoration:underline;'>Click to download {filename}</a> from '{bucket}'"
+
+def _format_transfer_object(result: Dict[str, Any], agent_header: str) -> str:
+    source_bucket = result.get("source_bucket")
+    dest_bucket = result.get("dest_bucket")
+    key = result.get("key")
+    op_type = "Moved" if result.get("operation") == "move_object" else "Copied"
+    return f"{agent_header}📦 {op_type} '{key}' from '{source_bucket}' to '{dest_bucket}'"
+
+def _format_list_buckets(result: Dict[str, Any], agent_header: str) -> str:
+    buckets = result.get("result", [])
+    if not buckets:
+        return "No S3 buckets found"
+    
+    response = f"{agent_header}📦 Found {result.get('count', 0)} S3 buckets:\n"
+    return response + "".join(
+        f"• {bucket['name']} (created: {bucket['created'][:10]})\n" for bucket in buckets
+    )
+
+def _format_list_objects(result: Dict[str, Any], agent_header: str) -> str:
+    objects = result.get("result", [])
+    bucket = result.get("bucket", "unknown")
+    
+    if not objects:
+        return f"{agent_header}📦 Bucket '{bucket}' is empty"
+    
+    response = f"{agent_header}📁 Found {result.get('count', 0)} objects in '{bucket}':\n"
+    response += "".join(
+        f"• {obj['key']} ({obj['size'] / 1024 / 1024:.2f} MB)\n" for obj in objects
+    )
+    if result.get("truncated"):
+        response += f"... (truncated, showing first {len(objects)})\n"
+    return response
+
+def _format_bucket_size(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    stats = result.get("result", {})
+    size = stats.get('total_size_gb', 'Unknown')
+    count = stats.get('object_count', 'Unknown')
+    if isinstance(size, str) and "Access denied" in size:
+        return f"{agent_header}❌ Cannot access bucket '{bucket}': {stats.get('error', 'Permission denied')}"
+    return f"{agent_header}📊 Bucket '{bucket}' size: {size} GB ({count} objects)"
+
+def _format_storage_class(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    stats = result.get("result", {})
+    total = result.get("total_objects", 0)
+    
+    if not stats:
+        return f"{agent_header}📉 No objects found in '{bucket}'"
+    
+    response = f"{agent_header}📉 Storage analysis for '{bucket}' ({total} objects):\n"
+    return response + "".join(
+        f"• {storage_class}: {data['count']} objects ({data['size'] / (1024 * 1024):.2f} MB)\n"
+        for storage_class, data in stats.items()
+    )
+
+def _format_bucket_info(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    info = result.get("result", {})
+    return f"{agent_header}📝 Bucket '{bucket}' info:\n• Region: {info.get('region')}\n• Has Policy: {info.get('has_policy')}\n• Owner: {info.get('owner')}"
+
+def _format_bucket_access(result: Dict[str, Any], agent_header: str) -> str:
+    buckets = result.get("result", [])
+    accessible = [b for b in buckets if b.get('accessible')]
+    
+    response = f"{agent_header}🔍 Bucket access test ({len(accessible)} accessible out of {len(buckets)}):\n"
+    return response + "".join(
+        f"{'✅' if bucket.get('accessible') else '❌'} {bucket['name']}\n" for bucket in buckets
+    )
+
+def _format_bucket_policy(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    policy_info = result.get("result", {})
+    
+    if not policy_info.get("has_policy"):
+        return f"{agent_header}📜 Bucket '{bucket}' has no policy configured"
+    
+    policy = policy_info.get("policy", {})
+    statements = policy.get("Statement", [])
+    
+    response = f"{agent_header}📜 Bucket '{bucket}' policy ({len(statements)} statements):\n"
+    for i, stmt in enumerate(statements, 1):
+        effect = stmt.get('Effect', 'Unknown')
+        actions = stmt.get('Action', [])
+        if isinstance(actions, str):
+            actions = [actions]
+        response += f"• Statement {i}: {effect} - {', '.join(actions[:3])}{'...' if len(actions) > 3 else ''}\n"
+    
+    return response
+
+def _format_delete_object(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    key = result.get("key")
+    return f"{agent_header}🗑️ Deleted '{key}' from bucket '{bucket}'"
+
+def _format_file_transfer(result: Dict[str, Any], agent_header: str) -> str:
+    bucket = result.get("bucket")
+    key = result.get("key")
+    local_path = result.get("local_path")
+    if result.get("operation") == "upload_file_to_s3":
+        return f"{agent_header}⬆️ Uploaded '{key}' from {local_path} to bucket '{bucket}'"
+    return f"{agent_header}⬇️ Downloaded '{key}' from bucket '{bucket}' to {local_path}"
+
+def _format_list_instances(result: Dict[str, Any], agent_header: str) -> str:
+    instances = result.get("result", [])
+    if not instances:
+        return "No EC2 instances found"
+    
+    response = f"{agent_header}🖥️ Found {result.get('count', 0)} EC2 instances:\n"
+    return response + "".join(
+        f"• {instance['id']} ({instance['name']}) - {instance['state']}\n" for instance in instances
+    )
+
+def _format_list_functions(result: Dict[str, Any], agent_header: str) -> str:
+    functions = result.get("result", [])
+    if not functions:
+        return "No Lambda functions found"
+    
+    response = f"{agent_header}⚡ Found {result.get('count', 0)} Lambda functions:\n"
+    return response + "".join(
+        f"• {func['name']} ({func['runtime']}) - {func['memory']}MB\n" for func in functions
+    )
+
+def _format_list_users(result: Dict[str, Any], agent_header: str) -> str:
+    users = result.get("result", [])
+    if not users:
+        return "No IAM users found"
+    
+    response = f"{agent_header}👥 Found {result.get('count', 0)} IAM users:\n"
+    return response + "".join(
+        f"• {user['name']} (created: {user['created'][:10]})\n" for user in users
+    )
+
+def _format_list_roles(result: Dict[str, Any], agent_header: str) -> str:
+    roles = result.get("result", [])
+    response = f"{agent_header}🔐 Found {result.get('count', 0)} IAM roles:\n"
+    return response + "".join(f"• {role['name']}\n" for role in roles)
+
+def _format_grant_s3_permissions(result: Dict[str, Any], agent_header: str) -> str:
+    return f"{agent_header}✅ {result.get('result', 'S3 permissions granted')}"
+
+def _format_list_alarms(result: Dict[str, Any], agent_header: str) -> str:
+    alarms = result.get("result", [])
+    if not alarms:
+        return "No CloudWatch alarms found"
+    
+    response = f"{agent_header}🚨 Found {result.get('count', 0)} CloudWatch alarms:\n"
+    return response + "".join(f"• {alarm['name']} - {alarm['state']}\n" for alarm in alarms)
+
+def _format_list_vpcs(result: Dict[str, Any], agent_header: str) -> str:
+    vpcs = result.get("result", [])
+    if not vpcs:
+        return "No VPCs found"
+    
+    response = f"{agent_header}🌐 Found {result.get('count', 0)} VPCs:\n"
+    return response + "".join(
+        f"• {vpc['id']} ({vpc['name']}) - {vpc['cidr']}{' (default)' if vpc['is_default'] else ''}\n"
+        for vpc in vpcs
+    )
+
+def _format_list_subnets(result: Dict[str, Any], agent_header: str) -> str:
+    subnets = result.get("result", [])
+    response = f"{agent_header}🔗 Found {result.get('count', 0)} subnets:\n"
+    return response + "".join(
+        f"• {subnet['id']} ({subnet['name']}) - {subnet['cidr']} in {subnet['az']}\n"
+        for subnet in subnets
+    )
+
+RESPONSE_FORMATTERS = {
+    ("s3", "download_object"): _format_download_object,
+    ("s3", "move_object"): _format_transfer_object,
+    ("s3", "copy_object"): _format_transfer_object,
+    ("s3", "list_buckets"): _format_list_buckets,
+    ("s3", "list_objects"): _format_list_objects,
+    ("s3", "get_bucket_size"): _format_bucket_size,
+    ("s3", "analyze_storage_class"): _format_storage_class,
+    ("s3", "get_bucket_info"): _format_bucket_info,
+    ("s3", "test_bucket_access"): _format_bucket_access,
+    ("s3", "get_bucket_policy"): _format_bucket_policy,
+    ("s3", "delete_object"): _format_delete_object,
+    ("s3", "upload_file_to_s3"): _format_file_transfer,
+    ("s3", "download_file_from_s3"): _format_file_transfer,
+    ("ec2", "list_instances"): _format_list_instances,
+    ("lambda", "list_functions"): _format_list_functions,
+    ("iam", "list_users"): _format_list_users,
+    ("iam", "list_roles"): _format_list_roles,
+    ("iam", "grant_s3_permissions"): _format_grant_s3_permissions,
+    ("cloudwatch", "list_alarms"): _format_list_alarms,
+    ("vpc", "list_vpcs"): _format_list_vpcs,
+    ("vpc", "list_subnets"): _format_list_subnets,
+}
\ No newline at end of file
@@ -8,6 +8,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
 
+# Canned reply per service keyword, checked in order
+SERVICE_REPLIES = (
+    ("s3", "I can help with S3 operations like listing buckets, managing objects, and setting policies. What specific S3 task do you need help with?"),
+    ("ec2", "For EC2, I can help with instance management, security groups, and networking. What EC2 operation are you looking for?"),
+    ("lambda", "I can assist with Lambda functions, including deployment, invocation, and monitoring. What Lambda task do you need help with?"),
+    ("iam", "For IAM, I can help with users, roles, policies, and permissions. What IAM operation do you need?"),
+    ("rds", "I can help with RDS database management, snapshots, and monitoring. What RDS task are you working on?"),
+    ("cloudwatch", "For CloudWatch, I can help with metrics, alarms, and logs. What monitoring do you need?"),
+)
+
 app = FastAPI(title="SevaAI Simple Enhanced AWS Agent")
 
 app.add_middleware(
@@ -109,20 +119,9 @@ async def chat(request: ChatRequest):
     try:
         user_message = request.messages[-1].content.lower()
         
-        # Simple responses for AWS services
-        if "s3" in user_message:
-            response = "I can help with S3 operations like listing buckets, managing objects, and setting policies. What specific S3 task do you need help with?"
-        elif "ec2" in user_message:
-            response = "For EC2, I can help with instance management, security groups, and networking. What EC2 operation are you looking for?"
-        elif "lambda" in user_message:
-            response = "I can assist with Lambda functions, including deployment, invocation, and monitoring. What Lambda task do you need help with?"
-        elif "iam" in user_message:
-            response = "For IAM, I can help with users, roles, policies, and permissions. What IAM operation do you need?"
-        elif "rds" in user_message:
-            response = "I can help with RDS database management, snapshots, and monitoring. What RDS task are you working on?"
-        elif "cloudwatch" in user_message:
-            response = "For CloudWatch, I can help with metrics, alarms, and logs. What monitoring do you need?"
-        else:
+        # Simple responses for AWS services; first keyword found wins
+        response = next((reply for keyword, reply in SERVICE_REPLIES if keyword in user_message), None)
+        if response is None:
             response = f"I understand you're asking about: '{request.messages[-1].content}'. I can help with AWS services like S3, EC2, Lambda, IAM, RDS, CloudWatch, VPC, and more. What specific AWS task do you need help with?"
         
         return ChatResponse(role="assistant", content=response)
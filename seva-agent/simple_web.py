@@ -4,26 +4,31 @@ Minimal web interface with AWS Bedrock
 import os
 import json
 import boto3
+from functools import lru_cache
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
 
 # Import AWS tools
 from aws_tools import AWSTools
+from agents.base_agent import CLIENT_CONFIG
 
 # AWS credentials
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = "us-east-1"
 
-# Initialize Bedrock client
-bedrock_runtime = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-)
+# Bedrock client, created on the first chat request rather than at import
+@lru_cache(maxsize=1)
+def get_bedrock_runtime():
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=AWS_REGION,
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        config=CLIENT_CONFIG
+    )
 
 # Initialize AWS tools
 aws_tools = AWSTools(
@@ -32,6 +37,15 @@ aws_tools = AWSTools(
     region_name=AWS_REGION
 )
 
+# Keyword-matched AWS lookups: trigger phrases, info type, tool
+AWS_QUERIES = [
+    (("list s3 buckets", "show s3 buckets"), "s3_buckets", aws_tools.list_s3_buckets),
+    (("list ec2", "show ec2"), "ec2_instances", aws_tools.list_ec2_instances),
+    (("list lambda", "show lambda"), "lambda_functions", aws_tools.list_lambda_functions),
+    (("list iam", "show iam"), "iam_users", aws_tools.list_iam_users),
+    (("list rds", "show rds"), "rds_instances", aws_tools.describe_rds_instances),
+]
+
 # System prompt
 SYSTEM_PROMPT = """
 You are a helpful AI data analyst assistant with access to AWS services. You can help with data analysis tasks, 
@@ -78,41 +92,42 @@ async def test():
     """Test endpoint"""
     return {"message": "API is working!"}
 
+# AWSTools already returns serialized JSON, so the /aws endpoints pass it through as-is
 @app.get("/aws/s3/buckets")
 async def list_s3_buckets():
     """List S3 buckets"""
     result = aws_tools.list_s3_buckets()
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 @app.get("/aws/s3/objects/{bucket_name}")
 async def list_s3_objects(bucket_name: str, prefix: str = ""):
     """List S3 objects"""
     result = aws_tools.list_s3_objects(bucket_name, prefix)
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 @app.get("/aws/ec2/instances")
 async def list_ec2_instances():
     """List EC2 instances"""
     result = aws_tools.list_ec2_instances()
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 @app.get("/aws/lambda/functions")
 async def list_lambda_functions():
     """List Lambda functions"""
     result = aws_tools.list_lambda_functions()
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 @app.get("/aws/iam/users")
 async def list_iam_users():
     """List IAM users"""
     result = aws_tools.list_iam_users()
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 @app.get("/aws/rds/instances")
 async def describe_rds_instances():
     """Describe RDS instances"""
     result = aws_tools.describe_rds_instances()
-    return JSONResponse(content=json.loads(result))
+    return Response(content=result, media_type="application/json")
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -136,16 +151,11 @@ async def echo(request: ChatRequest):
         aws_info = None
         
         # Simple keyword matching for AWS service requests
-        if "list s3 buckets" in user_message.lower() or "show s3 buckets" in user_message.lower():
-            aws_info = {"type": "s3_buckets", "data": json.loads(aws_tools.list_s3_buckets())}
-        elif "list ec2" in user_message.lower() or "show ec2" in user_message.lower():
-            aws_info = {"type": "ec2_instances", "data": json.loads(aws_tools.list_ec2_instances())}
-        elif "list lambda" in user_message.lower() or "show lambda" in user_message.lower():
-            aws_info = {"type": "lambda_functions", "data": json.loads(aws_tools.list_lambda_functions())}
-        elif "list iam" in user_message.lower() or "show iam" in user_message.lower():
-            aws_info = {"type": "iam_users", "data": json.loads(aws_tools.list_iam_users())}
-        elif "list rds" in user_message.lower() or "show rds" in user_message.lower():
-            aws_info = {"type": "rds_instances", "data": json.loads(aws_tools.describe_rds_instances())}
+        message_lower = user_message.lower()
+        for phrases, info_type, tool in AWS_QUERIES:
+            if any(phrase in message_lower for phrase in phrases):
+                aws_info = {"type": info_type, "data": json.loads(tool())}
+                break
         
         # If AWS info was requested, include it in the message to Claude
         if aws_info:
@@ -166,7 +176,7 @@ async def echo(request: ChatRequest):
         }
         
         # Call Bedrock with Claude 3.7 Sonnet model
-        response = bedrock_runtime.invoke_model(
+        response = get_bedrock_runtime().invoke_model(
             modelId="anthropic.claude-3-sonnet-20240229-v1:0",  # Claude 3 Sonnet
             body=json.dumps(body)
         )
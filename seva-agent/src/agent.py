@@ -24,11 +24,12 @@ def _resolve_env(obj):
     if isinstance(obj, dict):
         out = {}
         for k, v in obj.items():
-            if k.endswith("_env"):
+            name = k.removesuffix("_env")
+            if name != k:
                 env_val = os.getenv(v)
                 if env_val is None:
                     raise RuntimeError(f"Environment variable '{v}' is not set")
-                out[k[:-4]] = env_val  # strip _env suffix
+                out[name] = env_val
             else:
                 out[k] = _resolve_env(v)
         return out
@@ -0,0 +1,92 @@
+"""
+Unit tests for the EC2 agent's instance lookup and describe cache
+"""
+import unittest
+from unittest.mock import MagicMock
+
+from agents.ec2_agent import EC2Agent, DESCRIBE_CACHE_TTL
+
+def make_agent():
+    """EC2Agent whose describe_instances paginator returns two tagged instances"""
+    session = MagicMock()
+    ec2 = MagicMock()
+    session.client.return_value = ec2
+    ec2.get_paginator.return_value.paginate.return_value = [{'Reservations': [{'Instances': [
+        {'InstanceId': 'i-0123456789abcdef0', 'InstanceType': 't3.micro', 'State': {'Name': 'running'},
+         'Tags': [{'Key': 'Name', 'Value': 'Web'}]},
+        {'InstanceId': 'i-0fedcba9876543210', 'InstanceType': 't3.micro', 'State': {'Name': 'stopped'},
+         'Tags': [{'Key': 'Name', 'Value': 'db'}]},
+    ]}]}]
+    return EC2Agent(session), ec2
+
+class TestDescribeCache(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.ec2 = make_agent()
+        self.paginate = self.ec2.get_paginator.return_value.paginate
+
+    def test_repeated_listing_is_cached(self):
+        self.agent._list_instances()
+        self.assertEqual(self.agent._list_instances()['count'], 2)
+        self.assertEqual(self.paginate.call_count, 1)
+
+    def test_listing_expires(self):
+        self.agent._list_instances()
+        generation, described_at, instances = self.agent._describe_cache
+        self.agent._describe_cache = (generation, described_at - DESCRIBE_CACHE_TTL, instances)
+        self.agent._list_instances()
+        self.assertEqual(self.paginate.call_count, 2)
+
+    def test_start_invalidates_describe_cache(self):
+        self.agent._list_instances()
+        self.agent._start_instance('i-0123456789abcdef0')
+        self.agent._list_instances()
+        self.assertEqual(self.paginate.call_count, 2)
+
+    def test_stop_invalidates_describe_cache(self):
+        self.agent._list_instances()
+        self.agent._stop_instance('i-0123456789abcdef0')
+        self.agent._list_instances()
+        self.assertEqual(self.paginate.call_count, 2)
+
+class TestResolveInstanceId(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.ec2 = make_agent()
+        self.paginate = self.ec2.get_paginator.return_value.paginate
+
+    def test_cold_cache_describes_once(self):
+        self.assertEqual(self.agent._resolve_instance_id("start instance web"), 'i-0123456789abcdef0')
+        self.assertEqual(self.paginate.call_count, 1)
+
+    def test_warm_cache_makes_no_call(self):
+        self.agent._list_instances()
+        self.assertEqual(self.agent._resolve_instance_id("stop instance db"), 'i-0fedcba9876543210')
+        self.assertEqual(self.paginate.call_count, 1)
+
+    def test_name_lookup_ignores_case(self):
+        self.assertEqual(self.agent._resolve_instance_id("stop instance WEB"), 'i-0123456789abcdef0')
+
+    def test_index_is_rebuilt_after_a_refresh(self):
+        self.agent._resolve_instance_id("start instance web")
+        self.agent._start_instance('i-0123456789abcdef0')
+        self.paginate.return_value = [{'Reservations': [{'Instances': [
+            {'InstanceId': 'i-0aaaaaaaaaaaaaaaa', 'Tags': [{'Key': 'Name', 'Value': 'web'}]},
+        ]}]}]
+        self.assertEqual(self.agent._resolve_instance_id("stop instance web"), 'i-0aaaaaaaaaaaaaaaa')
+
+    def test_instance_id_needs_no_describe(self):
+        self.assertEqual(self.agent._resolve_instance_id("stop instance i-0123456789abcdef0"), 'i-0123456789abcdef0')
+        self.paginate.assert_not_called()
+
+    def test_unknown_name_on_cold_cache_describes_once(self):
+        self.assertIsNone(self.agent._resolve_instance_id("start instance missing"))
+        self.assertEqual(self.paginate.call_count, 1)
+        self.ec2.describe_instances.assert_not_called()
+
+    def test_unknown_name_on_warm_cache_makes_no_call(self):
+        self.agent._list_instances()
+        self.assertIsNone(self.agent._resolve_instance_id("start instance missing"))
+        self.assertEqual(self.paginate.call_count, 1)
+        self.ec2.describe_instances.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+"""
+Unit tests for the S3 agent's command parsing, copy checks and listing cache
+"""
+import unittest
+from datetime import datetime
+from unittest.mock import ANY, MagicMock
+
+from botocore.exceptions import ClientError
+
+from agents.s3_agent import S3Agent, COPY_OBJECT_RE, DELETE_KEYS_RE, KEY_SEPARATOR_RE, LISTING_CACHE_TTL
+
+def client_error(code: str, operation: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+def make_agent():
+    """S3Agent whose session hands out a single stub client"""
+    session = MagicMock()
+    s3 = MagicMock()
+    session.client.return_value = s3
+    s3.get_paginator.return_value.paginate.return_value = [
+        {'Contents': [{'Key': 'a.txt', 'Size': 1, 'LastModified': datetime(2024, 1, 1)}]}
+    ]
+    return S3Agent(session), s3
+
+class TestCommandParsing(unittest.TestCase):
+    def delete_keys(self, command):
+        match = DELETE_KEYS_RE.search(command)
+        return KEY_SEPARATOR_RE.split(match.group(1)) if match else None
+
+    def test_delete_single_key(self):
+        self.assertEqual(self.delete_keys("delete object a.txt in bucket logs"), ['a.txt'])
+
+    def test_delete_keys_with_spaces_after_commas(self):
+        self.assertEqual(self.delete_keys("delete objects a.txt, b.txt in bucket logs"), ['a.txt', 'b.txt'])
+
+    def test_delete_keys_without_spaces(self):
+        self.assertEqual(self.delete_keys("delete objects a.txt,b.txt ,c.txt in logs"), ['a.txt', 'b.txt', 'c.txt'])
+
+    def test_delete_without_key(self):
+        self.assertIsNone(self.delete_keys("delete everything"))
+
+    def test_copy_single_key(self):
+        match = COPY_OBJECT_RE.search("copy file a.txt from src-bucket to dst-bucket")
+        self.assertEqual(match.groups(), ('a.txt', 'src-bucket', 'dst-bucket'))
+
+    def test_copy_several_keys(self):
+        match = COPY_OBJECT_RE.search("Copy objects a.txt,b.txt from bucket src to bucket dst")
+        self.assertEqual(match.groups(), ('a.txt,b.txt', 'src', 'dst'))
+
+    def test_copy_several_keys_with_spaces_after_commas(self):
+        match = COPY_OBJECT_RE.search("copy files a.txt, b.txt from src to dst")
+        self.assertEqual(match.groups(), ('a.txt, b.txt', 'src', 'dst'))
+        self.assertEqual(KEY_SEPARATOR_RE.split(match.group(1)), ['a.txt', 'b.txt'])
+
+    def test_copy_needs_source_and_destination(self):
+        self.assertIsNone(COPY_OBJECT_RE.search("copy file a.txt to dst"))
+
+class TestDownloadObject(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.s3 = make_agent()
+        self.session = self.agent.session
+
+    def test_link_is_signed_for_the_bucket_region(self):
+        self.s3.get_bucket_location.return_value = {'LocationConstraint': 'eu-west-1'}
+        self.agent._download_object("download file a.txt from bucket logs")
+        self.session.client.assert_called_with('s3', region_name='eu-west-1', config=ANY)
+
+    def test_us_east_1_bucket_has_no_location_constraint(self):
+        self.s3.get_bucket_location.return_value = {'LocationConstraint': None}
+        self.assertEqual(self.agent._bucket_region('logs'), 'us-east-1')
+
+    def test_region_is_looked_up_once_per_bucket(self):
+        self.s3.get_bucket_location.return_value = {'LocationConstraint': 'eu-west-1'}
+        self.agent._download_object("download file a.txt from bucket logs")
+        self.agent._download_object("download file b.txt from bucket logs")
+        self.assertEqual(self.s3.get_bucket_location.call_count, 1)
+
+    def test_missing_bucket(self):
+        self.s3.get_bucket_location.side_effect = client_error('NoSuchBucket', 'GetBucketLocation')
+        result = self.agent._download_object("download file a.txt from bucket logs")
+        self.assertEqual(result, {"error": "Bucket 'logs' not found"})
+
+class TestCopyObject(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.s3 = make_agent()
+        self.missing = set()
+        self.s3.head_bucket.side_effect = self.head_bucket
+        self.s3.head_object.side_effect = self.head_object
+
+    def head_bucket(self, Bucket):
+        if Bucket in self.missing:
+            raise client_error('404', 'HeadBucket')
+
+    def head_object(self, Bucket, Key):
+        if Key in self.missing:
+            raise client_error('404', 'HeadObject')
+
+    def test_missing_source_bucket_is_reported_first(self):
+        self.missing = {'src', 'dst', 'a.txt'}
+        result = self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertEqual(result, {"error": "Bucket 'src' not found"})
+        self.s3.copy_object.assert_not_called()
+
+    def test_missing_destination_bucket_is_reported_before_keys(self):
+        self.missing = {'dst', 'a.txt'}
+        result = self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertEqual(result, {"error": "Bucket 'dst' not found"})
+        self.s3.copy_object.assert_not_called()
+
+    def test_missing_key_is_reported(self):
+        self.missing = {'a.txt'}
+        result = self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertEqual(result, {"error": "Object 'a.txt' not found in 'src'"})
+        self.s3.copy_object.assert_not_called()
+
+    def test_known_buckets_skip_head_bucket(self):
+        self.s3.list_buckets.return_value = {'Buckets': [
+            {'Name': name, 'CreationDate': datetime(2024, 1, 1)} for name in ('src', 'dst')
+        ]}
+        self.agent._list_buckets()
+        result = self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertEqual(result['result'], "Object copied successfully")
+        self.s3.head_bucket.assert_not_called()
+
+    def test_unlisted_bucket_is_still_probed(self):
+        self.s3.list_buckets.return_value = {'Buckets': [{'Name': 'src', 'CreationDate': datetime(2024, 1, 1)}]}
+        self.agent._list_buckets()
+        self.agent._copy_object("copy file a.txt from src to dst")
+        self.s3.head_bucket.assert_called_once_with(Bucket='dst')
+
+    def test_missing_second_key_is_reported(self):
+        self.missing = {'b.txt'}
+        result = self.agent._copy_object("copy files a.txt, b.txt from src to dst")
+        self.assertEqual(result, {"error": "Object 'b.txt' not found in 'src'"})
+        self.s3.copy_object.assert_not_called()
+
+    def test_every_key_is_copied(self):
+        result = self.agent._copy_object("copy files a.txt, b.txt from src to dst")
+        self.assertEqual(result['result'], "2 objects copied successfully")
+        self.assertEqual(
+            sorted(call.kwargs['Key'] for call in self.s3.copy_object.call_args_list),
+            ['a.txt', 'b.txt']
+        )
+
+    def test_partial_failure_reports_codes_and_copied_keys(self):
+        def copy_object(Bucket, Key, CopySource):
+            if Key == 'b.txt':
+                raise client_error('AccessDenied', 'CopyObject')
+        self.s3.copy_object.side_effect = copy_object
+        result = self.agent._copy_object("copy files a.txt,b.txt from src to dst")
+        self.assertEqual(result['copied'], ['a.txt'])
+        self.assertEqual(result['failed'], {'b.txt': 'AccessDenied'})
+        self.assertIn("b.txt (AccessDenied)", result['error'])
+
+class TestDeleteObject(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.s3 = make_agent()
+        self.s3.delete_objects.return_value = {}
+
+    def test_multiple_keys_go_in_one_batch(self):
+        self.agent._delete_object("delete objects a.txt, b.txt in bucket logs")
+        self.s3.delete_objects.assert_called_once_with(
+            Bucket='logs',
+            Delete={'Objects': [{'Key': 'a.txt'}, {'Key': 'b.txt'}], 'Quiet': True}
+        )
+        self.s3.delete_object.assert_not_called()
+
+    def test_batch_errors_are_reported(self):
+        self.s3.delete_objects.return_value = {'Errors': [{'Key': 'b.txt', 'Code': 'AccessDenied'}]}
+        result = self.agent._delete_object("delete objects a.txt, b.txt in bucket logs")
+        self.assertEqual(result, {"error": "Failed to delete: b.txt"})
+
+class TestListingCache(unittest.TestCase):
+    def setUp(self):
+        self.agent, self.s3 = make_agent()
+        self.paginate = self.s3.get_paginator.return_value.paginate
+
+    def test_repeated_listing_is_cached(self):
+        self.agent._list_objects('logs')
+        self.agent._list_objects('logs')
+        self.assertEqual(self.paginate.call_count, 1)
+
+    def test_listing_expires(self):
+        self.agent._list_objects('logs')
+        result, listed_at = self.agent._listing_cache['logs']
+        self.agent._listing_cache['logs'] = (result, listed_at - LISTING_CACHE_TTL)
+        self.agent._list_objects('logs')
+        self.assertEqual(self.paginate.call_count, 2)
+
+    def test_delete_invalidates_listing(self):
+        self.agent._list_objects('logs')
+        self.agent._delete_object("delete object a.txt in bucket logs")
+        self.assertNotIn('logs', self.agent._listing_cache)
+        self.agent._list_objects('logs')
+        self.assertEqual(self.paginate.call_count, 2)
+
+    def test_copy_invalidates_destination_listing(self):
+        self.agent._list_objects('src')
+        self.agent._list_objects('dst')
+        self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertNotIn('dst', self.agent._listing_cache)
+        self.assertIn('src', self.agent._listing_cache)
+
+    def test_failed_copy_still_invalidates_destination_listing(self):
+        self.s3.copy_object.side_effect = client_error('AccessDenied', 'CopyObject')
+        self.agent._list_objects('dst')
+        self.agent._copy_object("copy file a.txt from src to dst")
+        self.assertNotIn('dst', self.agent._listing_cache)
+
+    def test_create_adds_bucket_to_known_names(self):
+        self.s3.list_buckets.return_value = {'Buckets': []}
+        self.agent._list_buckets()
+        self.assertFalse(self.agent._is_known_bucket('new-bucket'))
+        self.agent._create_bucket('new-bucket')
+        self.assertTrue(self.agent._is_known_bucket('new-bucket'))
+
+if __name__ == "__main__":
+    unittest.main()